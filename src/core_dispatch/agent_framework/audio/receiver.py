@@ -1,9 +1,11 @@
 # src/core_dispatch/agent_framework/audio/receiver.py
 
 import re
-import json
 import asyncio
 import logging
+import math
+import fcntl
+import threading
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
@@ -13,6 +15,7 @@ from dataclasses import dataclass
 from typing import Optional, Callable, Any
 
 from core_dispatch.agent_framework.core.base_agent import BaseAgent
+from core_dispatch.agent_framework.utils import json_codec
 from core_dispatch.agent_framework.audio.transcription import (
     TranscriptionConfig,
     TranscriptionResult,
@@ -21,12 +24,14 @@ from core_dispatch.agent_framework.audio.transcription import (
 )
 
 LOCK_FILE = '/tmp/tx_rx_lock'
+LOCK_POLL_INTERVAL = 0.2  # seconds between lock checks
 
 # Import settings from core_dispatch.launch_control.config
 from core_dispatch.launch_control.config.settings import (
     SAMPLE_RATE,
     CHANNELS,
     AUDIO_DEVICE_INDEX,
+    AUDIO_BLOCKSIZE,
     AUDIO_THRESHOLD,
     SILENCE_THRESHOLD,
     MIN_RECORDING_DURATION,
@@ -39,11 +44,37 @@ from core_dispatch.launch_control.config.settings import (
 )
 
 
+# numba is an optional speedup for the per-callback level check
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _sum_squares(flat):
+        total = 0.0
+        for i in range(flat.size):
+            total += flat[i] * flat[i]
+        return total
+else:
+    _sum_squares = None
+
+
+def _rms(samples) -> float:
+    """Root-mean-square level of a sample block, without allocating a squared copy."""
+    flat = samples.ravel()
+    if _sum_squares is not None:
+        return math.sqrt(_sum_squares(flat) / flat.size)
+    return float(np.sqrt(np.dot(flat, flat) / flat.size))
+
+
 @dataclass
 class AudioConfig:
     sample_rate: int = SAMPLE_RATE
     channels: int = CHANNELS
     device_index: int = AUDIO_DEVICE_INDEX
+    blocksize: int = AUDIO_BLOCKSIZE
     audio_threshold: float = AUDIO_THRESHOLD
     silence_threshold: float = SILENCE_THRESHOLD
     min_duration: float = MIN_RECORDING_DURATION
@@ -51,6 +82,9 @@ class AudioConfig:
     pre_roll: float = PRE_ROLL_DURATION
     post_roll: float = POST_ROLL_DURATION
     queue_size: int = 100
+    # Local energy gate: skip takes whose peak or active-sample share is too low to be speech
+    min_peak_ratio: float = 2.0
+    min_active_fraction: float = 0.1
     project_id: str = GOOGLE_CLOUD_PROJECT if GOOGLE_CLOUD_PROJECT else ""
     transcription_service_type: str = TRANSCRIPTION_SERVICE_TYPE
     api_key: Optional[str] = OPENAI_API_KEY
@@ -63,19 +97,25 @@ class AudioReceiverAgent(BaseAgent):
         self,
         config: AudioConfig,
         on_transcription: Callable[[str], Any],
-        debug_mode: bool = False
+        debug_mode: bool = False,
+        tx_active: Optional[threading.Event] = None
     ):
         super().__init__()
         self.config = config
         self.on_transcription = on_transcription
         self.debug_mode = debug_mode
+        # Transmitter's in-process "playing" flag; when absent, fall back to the lock file
+        self._tx_active = tx_active
 
         self.audio_queue = asyncio.Queue(maxsize=config.queue_size)
         self.terminate_flag = asyncio.Event()
         self.loop = None
+        # Mirrors the transmitter's flock on LOCK_FILE so the audio callback never has to probe it
+        self._paused = False
 
         transcription_config = TranscriptionConfig(
             sample_rate=config.sample_rate,
+            channels=config.channels,
             language="en-US",
             debug_mode=debug_mode,
             project_id=config.project_id,
@@ -86,13 +126,23 @@ class AudioReceiverAgent(BaseAgent):
             transcription_config
         )
 
-        self.pre_roll_buffer = []
+        # Pre-roll ring buffer bounded by duration (samples), not by callback count
+        pre_roll_samples = int(config.pre_roll * config.sample_rate)
+        self._pre_roll_buf = np.zeros((pre_roll_samples, config.channels), dtype=np.float32)
+        self._pre_roll_idx = 0
+        self._pre_roll_filled = 0
         self.recording = False
-        self.audio_frames = []
+        # Pre-allocated take buffer: room for the longest recording plus its pre-roll
+        max_samples = int((config.max_duration + config.pre_roll) * config.sample_rate)
+        self._rec_buf = np.empty((max_samples, config.channels), dtype=np.float32)
+        self._rec_write_idx = 0
         self.silence_counter = 0.0
         self.recording_duration = 0.0
         self.stream = None
 
+        # Compile the level kernel now rather than on the first audio callback
+        _rms(np.zeros(1, dtype=np.float32))
+
     async def initialize(self):
         """Initialize the transcription service and test audio input."""
         await self.transcription_service.initialize()
@@ -104,8 +154,10 @@ class AudioReceiverAgent(BaseAgent):
         """Start the audio reception and transcription process."""
         self.loop = asyncio.get_running_loop()
 
-        # Start processing task
+        # Start processing and lock-watch tasks
         asyncio.create_task(self._process_audio_queue())
+        if self._tx_active is None:
+            asyncio.create_task(self._watch_lock_file())
 
         # Start audio stream
         try:
@@ -113,6 +165,7 @@ class AudioReceiverAgent(BaseAgent):
                 device=self.config.device_index,
                 samplerate=self.config.sample_rate,
                 channels=self.config.channels,
+                blocksize=self.config.blocksize,
                 dtype='float32',
                 callback=self._audio_callback
             )
@@ -141,22 +194,44 @@ class AudioReceiverAgent(BaseAgent):
             except Exception as e:
                 self.logger.error(f"Error processing audio: {e}")
 
+    async def _watch_lock_file(self):
+        """Poll the transmitter's flock on LOCK_FILE and mirror it into self._paused."""
+        fd = os.open(LOCK_FILE, os.O_RDONLY | os.O_CREAT, 0o666)
+        try:
+            while not self.terminate_flag.is_set():
+                self._paused = self._tx_lock_held(fd)
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _tx_lock_held(fd: int) -> bool:
+        """True if another process holds an exclusive flock on fd's file."""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+
     def _audio_callback(self, indata, frames, time_info, status):
         """Handle incoming audio data."""
-        if os.path.exists(LOCK_FILE):
+        paused = self._tx_active.is_set() if self._tx_active is not None else self._paused
+        if paused:
             # self.logger.info("Lock file detected. Pausing audio processing.")
+            if self.recording or self._pre_roll_filled:
+                # The lock is only polled, so the transmitter may have been on the air for
+                # up to LOCK_POLL_INTERVAL already; don't let its audio seed a take
+                self._discard_capture()
             return None, sd.CallbackFlags()
 
         if status:
             self.logger.warning(f"Audio stream status: {status}")
 
-        rms = np.sqrt(np.mean(np.square(indata)))
+        rms = _rms(indata)
 
         # Update pre-roll buffer
-        self.pre_roll_buffer.append(indata.copy())
-        pre_roll_frames = int(self.config.pre_roll * self.config.sample_rate / frames)
-        if len(self.pre_roll_buffer) > pre_roll_frames:
-            self.pre_roll_buffer.pop(0)
+        self._push_pre_roll(indata)
 
         if not self.recording and rms > self.config.audio_threshold:
             self._start_recording()
@@ -164,17 +239,51 @@ class AudioReceiverAgent(BaseAgent):
         if self.recording:
             self._handle_recording(indata, rms, frames)
 
+    def _discard_capture(self):
+        """Drop the take in progress and the pre-roll history."""
+        if self.recording:
+            self.logger.debug("Discarding recording interrupted by transmission")
+        self.recording = False
+        self._rec_write_idx = 0
+        self._pre_roll_idx = 0
+        self._pre_roll_filled = 0
+
+    def _push_pre_roll(self, block):
+        """Write a block into the pre-roll ring buffer, overwriting the oldest samples."""
+        size = len(self._pre_roll_buf)
+        if size == 0:
+            return
+        if len(block) >= size:
+            self._pre_roll_buf[:] = block[-size:]
+            self._pre_roll_idx = 0
+            self._pre_roll_filled = size
+            return
+        start = self._pre_roll_idx
+        first = min(len(block), size - start)
+        self._pre_roll_buf[start:start + first] = block[:first]
+        if first < len(block):
+            self._pre_roll_buf[:len(block) - first] = block[first:]
+        self._pre_roll_idx = (start + len(block)) % size
+        self._pre_roll_filled = min(size, self._pre_roll_filled + len(block))
+
     def _start_recording(self):
         """Start a new recording."""
         self.recording = True
-        self.audio_frames = self.pre_roll_buffer.copy()
+        self._rec_write_idx = 0
+        idx, filled = self._pre_roll_idx, self._pre_roll_filled
+        if filled < len(self._pre_roll_buf):
+            self._append_to_recording(self._pre_roll_buf[:filled])
+        else:
+            # Buffer has wrapped: oldest samples start at the write index
+            self._append_to_recording(self._pre_roll_buf[idx:])
+            self._append_to_recording(self._pre_roll_buf[:idx])
         self.silence_counter = 0.0
         self.recording_duration = 0.0
         self.logger.debug("Started recording")
 
     def _handle_recording(self, indata, rms, frames):
         """Handle ongoing recording state."""
-        self.audio_frames.append(indata.copy())
+        self._append_to_recording(indata)
         frame_duration = frames / self.config.sample_rate
         self.recording_duration += frame_duration
 
@@ -186,6 +295,13 @@ class AudioReceiverAgent(BaseAgent):
         if self._should_stop_recording():
             self._stop_recording()
 
+    def _append_to_recording(self, block):
+        """Copy a block of samples into the take buffer, clipping at its end."""
+        start = self._rec_write_idx
+        count = min(len(block), len(self._rec_buf) - start)
+        self._rec_buf[start:start + count] = block[:count]
+        self._rec_write_idx = start + count
+
     def _should_stop_recording(self) -> bool:
         """Determine if recording should stop."""
         return (
@@ -197,22 +313,26 @@ class AudioReceiverAgent(BaseAgent):
     def _stop_recording(self):
         """Stop recording and queue audio for processing."""
         self.recording = False
-        audio_data = np.concatenate(self.audio_frames)
+        # Copy out of the shared buffer; the next take will overwrite it
+        audio_data = self._rec_buf[:self._rec_write_idx].copy()
         try:
             if self.loop and not self.audio_queue.full():
-                self.loop.call_soon_threadsafe(
-                    lambda: asyncio.create_task(self.audio_queue.put(audio_data))
-                )
+                # put_nowait is safe here: fullness was just checked and only this thread produces
+                self.loop.call_soon_threadsafe(self.audio_queue.put_nowait, audio_data)
                 self.logger.debug("Queued audio for processing")
             else:
                 self.logger.warning("Audio queue full or loop not set, dropping audio frame")
         except RuntimeError as e:
             self.logger.error(f"Failed to enqueue audio data: {e}")
-        self.audio_frames = []
+        self._rec_write_idx = 0
 
     async def _transcribe_audio(self, audio_data):
         """Transcribe audio and save JSON output."""
         try:
+            if not self._has_speech_energy(audio_data):
+                self.logger.info("Skipped near-silent recording without transcribing it.")
+                return
+
             result: Optional[TranscriptionResult] = await self.transcription_service.transcribe(audio_data)
             if result and result.text:
                 self.logger.debug(f"Transcribed: {result.text}")
@@ -233,23 +353,25 @@ class AudioReceiverAgent(BaseAgent):
             self.logger.error(f"Transcription error: {e}")
     
     
+    def _has_speech_energy(self, audio_data) -> bool:
+        """Cheap energy check so false triggers never cost a transcription round-trip."""
+        magnitude = np.abs(audio_data)
+        if magnitude.max() < self.config.min_peak_ratio * self.config.audio_threshold:
+            return False
+        active = np.count_nonzero(magnitude > self.config.audio_threshold)
+        return active >= self.config.min_active_fraction * magnitude.size
+
     async def _test_audio_input(self):
         """Test audio input configuration to ensure levels are okay."""
         duration = 2
         self.logger.info(f"Testing audio input for {duration} seconds...")
     
-        # Record audio for the test duration
-        recording = sd.rec(
-            int(duration * self.config.sample_rate),
-            samplerate=self.config.sample_rate,
-            channels=self.config.channels,
-            device=self.config.device_index,
-            dtype='float32'
-        )
-        sd.wait()
+        # Record audio for the test duration; sd.wait() blocks, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        recording = await loop.run_in_executor(None, self._record_test_clip, duration)
     
         # Calculate RMS level of the recording
-        rms = np.sqrt(np.mean(np.square(recording)))
+        rms = _rms(recording)
     
         self.logger.info(f"Current RMS level: {rms:.6f}")
         self.logger.info(f"Audio threshold: {self.config.audio_threshold:.6f}")
@@ -260,6 +382,18 @@ class AudioReceiverAgent(BaseAgent):
         else:
             self.logger.info("Audio input test passed.")
     
+    def _record_test_clip(self, duration: float):
+        """Blocking capture used by _test_audio_input."""
+        recording = sd.rec(
+            int(duration * self.config.sample_rate),
+            samplerate=self.config.sample_rate,
+            channels=self.config.channels,
+            device=self.config.device_index,
+            dtype='float32'
+        )
+        sd.wait()
+        return recording
+
     def _save_json_output(self, transcription: str, audio_path: Optional[str]):
         """Save transcription results as a JSON file to the queue directory."""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -276,9 +410,8 @@ class AudioReceiverAgent(BaseAgent):
             json_data["audio_file"] = audio_path
     
         json_path = os.path.join(queue_dir, f"transcription_{timestamp}.json")
-        with open(json_path, 'w') as f:
-            json.dump(json_data, f, indent=4)
-            f.write('\n')
+        with open(json_path, 'wb') as f:
+            f.write(json_codec.dumps(json_data) + b'\n')
 
         self.logger.debug(f"Saved transcription JSON to {json_path}")
 
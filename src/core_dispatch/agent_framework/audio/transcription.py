@@ -1,16 +1,17 @@
 # src/core_dispatch/agent_framework/audio/transcription.py
 
 from abc import ABC, abstractmethod
+import asyncio
+import functools
 import io
 from typing import Optional
 from dataclasses import dataclass
+import numpy as np
 import soundfile as sf
 import logging
 
-from openai import OpenAI
-from google.api_core.client_options import ClientOptions
-from google.cloud.speech_v2 import SpeechClient
-from google.cloud.speech_v2.types import cloud_speech
+# Cloud SDKs are imported inside each service's initialize() so startup only
+# pays for the backend that is actually selected (google-cloud pulls in grpc).
 
 from core_dispatch.launch_control.config.settings import (
     TRANSCRIPTION_SERVICE_TYPE,
@@ -21,6 +22,7 @@ from core_dispatch.launch_control.config.settings import (
 @dataclass
 class TranscriptionConfig:
     sample_rate: int
+    channels: int = 1
     language: str = "en-US"
     debug_mode: bool = False
     project_id: Optional[str] = None
@@ -51,14 +53,27 @@ class TranscriptionService(ABC):
 
     def _prepare_audio(self, audio_data) -> io.BytesIO:
         audio_buffer = io.BytesIO()
-        sf.write(audio_buffer, audio_data, self.config.sample_rate, format='WAV', subtype='PCM_16')
+        # Already int16, so libsndfile writes the samples through without converting them
+        sf.write(audio_buffer, self._to_int16(audio_data), self.config.sample_rate, format='WAV', subtype='PCM_16')
         audio_buffer.seek(0)
         return audio_buffer
 
+    @staticmethod
+    def _to_int16(audio_data) -> np.ndarray:
+        """Scale float samples in [-1, 1] to int16 with vectorized NumPy ops."""
+        scaled = np.multiply(audio_data, 32767.0, dtype=np.float32)
+        np.clip(scaled, -32768, 32767, out=scaled)
+        return scaled.astype(np.int16)
+
 class GoogleChirpService(TranscriptionService):
     async def initialize(self) -> None:
         if not self.config.project_id:
             raise ValueError("project_id must be set for GoogleChirpService")
+        from google.api_core.client_options import ClientOptions
+        from google.cloud.speech_v2 import SpeechClient
+        from google.cloud.speech_v2.types import cloud_speech
+
+        self.cloud_speech = cloud_speech
         self.client = SpeechClient(
             client_options=ClientOptions(
                 api_endpoint="us-central1-speech.googleapis.com",
@@ -66,11 +81,17 @@ class GoogleChirpService(TranscriptionService):
         )
 
     async def transcribe(self, audio_data) -> Optional[TranscriptionResult]:
+        cloud_speech = self.cloud_speech
         try:
-            audio_content = self._prepare_audio(audio_data).read()
+            # Send raw LINEAR16 with an explicit format instead of wrapping it in a WAV file
+            audio_content = self._to_int16(audio_data).tobytes()
 
             config = cloud_speech.RecognitionConfig(
-                auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
+                explicit_decoding_config=cloud_speech.ExplicitDecodingConfig(
+                    encoding=cloud_speech.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+                    sample_rate_hertz=self.config.sample_rate,
+                    audio_channel_count=self.config.channels,
+                ),
                 language_codes=[self.config.language],
                 model="chirp",
             )
@@ -82,7 +103,11 @@ class GoogleChirpService(TranscriptionService):
             )
 
             self.logger.debug("Sending audio to Google Chirp...")
-            response = self.client.recognize(request=request)
+            # The gRPC call blocks; run it in the executor so the event loop stays responsive
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, functools.partial(self.client.recognize, request=request)
+            )
 
             if response.results:
                 result = response.results[0].alternatives[0]
@@ -102,6 +127,8 @@ class OpenAIWhisperService(TranscriptionService):
     async def initialize(self) -> None:
         if not self.config.api_key:
             raise ValueError("api_key must be set for OpenAIWhisperService")
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=self.config.api_key)
 
     async def transcribe(self, audio_data) -> Optional[TranscriptionResult]:
@@ -111,10 +138,16 @@ class OpenAIWhisperService(TranscriptionService):
             audio_buffer.name = 'audio.wav'
 
             self.logger.debug("Sending audio to Whisper...")
-            response = self.client.audio.transcriptions.create(
-                file=audio_buffer,
-                model="whisper-1",
-                language=self.config.language.split('-')[0]
+            # The HTTP call blocks; run it in the executor so the event loop stays responsive
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.client.audio.transcriptions.create,
+                    file=audio_buffer,
+                    model="whisper-1",
+                    language=self.config.language.split('-')[0]
+                )
             )
 
             return TranscriptionResult(
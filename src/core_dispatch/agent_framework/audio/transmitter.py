@@ -1,20 +1,35 @@
 import os
 import sys
+import asyncio
 import shutil
-import json
+import errno
+import fcntl
+import hashlib
 import time
 import logging
 from logging.handlers import WatchedFileHandler
 import threading
 from datetime import datetime, timedelta
 import queue
+from collections import Counter, OrderedDict, deque
 import argparse
 import warnings
 import subprocess
 import random
+import re
 import requests
+import sounddevice as sd
+import soundfile as sf
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Union
+
+# pyahocorasick is an optional speedup for activation-phrase matching; fall back to a regex
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
@@ -24,6 +39,10 @@ from core_dispatch.agent_framework.core.base_agent import BaseAgent
 
 # Import your tool(s)
 from core_dispatch.agent_framework.tools.tool_inventory_lookup import InventoryLookupTool
+from core_dispatch.agent_framework.tools.tool_result import DirectReply
+from core_dispatch.agent_framework.utils import json_codec
+from core_dispatch.agent_framework.utils.semantic_cache import SemanticCache
+from core_dispatch.agent_framework.utils.speech_chunker import SpeechChunker, split_for_speech
 
 # TTS services
 from core_dispatch.agent_framework.utils.tts_service import (
@@ -48,7 +67,15 @@ from core_dispatch.launch_control.config.settings import (
     TRANSCRIPTIONS_DIR,
     PROCESSED_TRANSCRIPTIONS_DIR,
     TRANSCRIPTIONS_LOG_FILE,
+    TRANSCRIPTIONS_WATCH_POLLING,
+    TX_PLAYBACK_BACKEND,
+    TX_RELEASE_DELAY,
+    CHAT_CACHE_SIZE,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_PATH,
     TTS_PROVIDER,
+    TTS_CACHE_MAX_BYTES,
     UNREALSPEECH_API_KEY,
     DEFAULT_VOICE,
     VOICE_MAPPING
@@ -56,6 +83,22 @@ from core_dispatch.launch_control.config.settings import (
 
 LOCK_FILE = '/tmp/tx_rx_lock'
 CONVERSATION_LOG_FILE = "conversation_log.txt"
+# "TOOL_CALL <tool>: <method> <args>" -> (tool, method, args)
+TOOL_CALL_RE = re.compile(r'^\s*TOOL_CALL\s+(\w+)\s*:\s*(\w+)\s+(.*\S)\s*$')
+# A transcription modified more recently than this may still be being written
+TRANSCRIPTION_SETTLE_SECONDS = 0.5
+# How often the directory is swept while idle, when no inotify watcher is running
+IDLE_SWEEP_SECONDS = 1.0
+
+
+def _static_prompt(prompt_template: str) -> str:
+    """
+    Render a persona prompt without the clock, so the system message stays
+    byte-identical across turns (a stable prefix the API can cache).
+    The time itself is sent as the last message instead.
+    """
+    text = prompt_template.replace('{military_time}', 'the current time (given at the end of the conversation)')
+    return text.replace('{{', '{').replace('}}', '}')
 
 
 @dataclass
@@ -76,32 +119,45 @@ class AudioTransmitterConfig:
     transcriptions_dir: str = TRANSCRIPTIONS_DIR
     processed_transcriptions_dir: str = PROCESSED_TRANSCRIPTIONS_DIR
     transcriptions_log_file: str = TRANSCRIPTIONS_LOG_FILE
+    transcriptions_watch_polling: bool = TRANSCRIPTIONS_WATCH_POLLING
+    playback_backend: str = TX_PLAYBACK_BACKEND
+    tx_release_delay: float = TX_RELEASE_DELAY
+    chat_cache_size: int = CHAT_CACHE_SIZE
+    semantic_cache_threshold: float = SEMANTIC_CACHE_THRESHOLD
+    semantic_cache_size: int = SEMANTIC_CACHE_SIZE
+    semantic_cache_path: str = SEMANTIC_CACHE_PATH
     tts_provider: str = TTS_PROVIDER
+    tts_cache_max_bytes: int = TTS_CACHE_MAX_BYTES
     unrealspeech_api_key: Optional[str] = UNREALSPEECH_API_KEY
-    default_voice: Dict[str, str] = None
+    default_voice: str = DEFAULT_VOICE
 
 
 class AudioTransmitterAgent(BaseAgent):
     """
     A transmitter that:
-      1. Watches for new transcriptions in TRANSCRIPTIONS_DIR
+      1. Watches for new transcriptions in TRANSCRIPTIONS_DIR (inotify via watchdog, else polling)
       2. Determines if (and which) persona should respond
       3. Generates the AI response (GPT-4)
       4. Handles tool calls in a two-pass approach:
          - pass #1: parse SAY lines (immediate TTS) & TOOL_CALL lines (invoke tool)
          - pass #2: feed the tool result back to GPT for a final user-friendly message
-      5. Converts final user-facing text to audio (TTS)
-      6. Plays the audio
+      5. Converts final user-facing text to audio (TTS) on its own thread
+      6. Plays the audio, overlapping with synthesis of the next response
       7. Moves processed transcriptions and handles cleanup
     """
     def __init__(self, config: AudioTransmitterConfig, debug_mode: bool = False,
-                 persona_names=None, profile_name=None, load_all_personas=False):
+                 persona_names=None, profile_name=None, load_all_personas=False,
+                 tx_active: Optional[threading.Event] = None):
         super().__init__()
         self.config = config
         self.debug_mode = debug_mode
         self.profile_name = profile_name
 
         # Lazy import of OpenAI so we can handle missing dependencies
+        # Pooled HTTP session for UnrealSpeech, so repeat TTS calls skip the TCP+TLS handshake.
+        # The OpenAI client already keeps its own connection pool for as long as it lives.
+        self._http_session = requests.Session()
+        self._http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
         try:
             from openai import OpenAI
             self.client = OpenAI(api_key=config.api_key)
@@ -111,17 +167,46 @@ class AudioTransmitterAgent(BaseAgent):
 
         # Setup logging
         self._initialize_logging()
+        # Line-buffered so each turn lands on disk without reopening the file
+        self._convo_log_fh = open(CONVERSATION_LOG_FILE, 'a', buffering=1)
 
         # Additional attributes
         self.terminate_flag = threading.Event()
+        # Set while we're on the air; an in-process receiver can share it instead of polling LOCK_FILE
+        self.tx_active = tx_active if tx_active is not None else threading.Event()
         self.response_queue = queue.Queue(maxsize=self.config.response_queue_max_size)
-        self.conversation_history = []
+        # Synthesized clips waiting for the speaker; small so TTS runs at most a couple ahead
+        self.audio_queue = queue.Queue(maxsize=2)
+        # Conversation history as parallel columns, oldest first: POSIX timestamps, roles, contents.
+        # maxlen enforces conversation_history_limit on every append (always via _append_history).
+        history_limit = self.config.conversation_history_limit
+        self._hist_ts = deque(maxlen=history_limit)
+        self._hist_role = deque(maxlen=history_limit)
+        self._hist_content = deque(maxlen=history_limit)
         self.personas = {}
         self.activation_phrases_set = set()
+        # Activation phrase -> persona in priority order, plus a single-pass matcher
+        # (Aho-Corasick automaton or regex) over all of them, built once personas load
+        self._activation_pattern = None
+        self._activation_personas = {}
         self.active_persona = None
+        # time.monotonic() of the last exchange with the active persona
         self.last_interaction_time = None
         self.CONVERSATION_TIMEOUT = timedelta(minutes=5)  # adjustable
-        self.assistant_responses = []
+        self._timeout_seconds = self.CONVERSATION_TIMEOUT.total_seconds()
+        # Exact-match reply cache: hash of the full messages list -> reply text (LRU order)
+        self._completion_cache = OrderedDict()
+        # Near-duplicate reply cache (opt-in: needs an embeddings call per turn)
+        self.semantic_cache = None
+        if self.config.semantic_cache_threshold > 0 and self.client:
+            self.semantic_cache = SemanticCache(
+                self.config.semantic_cache_path,
+                threshold=self.config.semantic_cache_threshold,
+                capacity=self.config.semantic_cache_size
+            )
+        # Last 10 replies (pre-stripped) plus a count of each, for O(1) echo checks
+        self.assistant_responses = deque(maxlen=10)
+        self._assistant_response_counts = Counter()
         self.load_personas_on_init = load_all_personas
         self.persona_names = persona_names if persona_names else []
 
@@ -130,18 +215,31 @@ class AudioTransmitterAgent(BaseAgent):
         self._init_tts_service()
 
         # Tools dictionary
-        # If you add more, just register them here
+        # If you add more, just register an instance here (tools are reused across calls)
         self.tools = {
-            "InventoryLookupTool": InventoryLookupTool
+            "InventoryLookupTool": InventoryLookupTool()
         }
 
+        # Transcription files reported by the directory watcher (or a sweep), in arrival order
+        self._pending_files = queue.Queue()
+        self._observer = None
+        # Files already handled but not yet moved out of transcriptions_dir (so never answered twice)
+        self._dispatched = set()
+        # Files that failed to parse -> their (mtime_ns, size) then; retried once either changes
+        self._unreadable = {}
+        self._check_processed_dir_device()
+
         # Threads
         self.generator_thread = None
+        self.synthesizer_thread = None
         self.transmitter_thread = None
+        self._current_player = None
+        # Persistent playback stream and the (samplerate, channels) it was opened with
+        self._output_stream = None
+        self._output_format = None
 
-        if os.path.exists(LOCK_FILE):
-            os.remove(LOCK_FILE)
-            self.logger.info("Removed stale lock file on startup.")
+        # Held with flock() while transmitting; the kernel drops it if we die, so no stale locks
+        self._lock_fd = os.open(LOCK_FILE, os.O_RDONLY | os.O_CREAT, 0o666)
 
         # Load personas
         if self.load_personas_on_init:
@@ -149,13 +247,17 @@ class AudioTransmitterAgent(BaseAgent):
         else:
             for name in self.persona_names:
                 self.logger.info(f"Loading persona '{name}'.")
-                p_data = self._load_persona(name)
-                if p_data:
-                    self.personas[name] = p_data
+                self._register_persona(name, self._load_persona(name))
+        self._build_activation_matcher()
 
         if not self.personas:
             self.logger.error("No personas loaded. The transmitter won't respond to anything.")
 
+        # Syntheses run in parallel but are queued as futures, so playback order is reply order.
+        # Two workers cover one persona's next sentence; more personas can burst more replies.
+        tts_workers = min(4, max(2, len(self.personas)))
+        self._tts_executor = ThreadPoolExecutor(max_workers=tts_workers, thread_name_prefix='tts')
+
         loaded_list = ', '.join(self.personas.keys()) if self.personas else "None"
         self.logger.info(f"Transmitter ready with personas: {loaded_list}")
 
@@ -186,7 +288,11 @@ class AudioTransmitterAgent(BaseAgent):
             if not self.client:
                 self.logger.error("OpenAI TTS selected, but 'self.client' is None (import error?).")
                 return
-            self.tts_service = OpenAITTSService(self.client, self.config.tts_audio_dir)
+            self.tts_service = OpenAITTSService(
+                self.client,
+                self.config.tts_audio_dir,
+                cache_max_bytes=self.config.tts_cache_max_bytes
+            )
 
         elif provider == 'unrealspeech':
             if not self.config.unrealspeech_api_key:
@@ -194,7 +300,9 @@ class AudioTransmitterAgent(BaseAgent):
                 return
             self.tts_service = UnrealSpeechTTSService(
                 api_key=self.config.unrealspeech_api_key,
-                tts_audio_dir=self.config.tts_audio_dir
+                tts_audio_dir=self.config.tts_audio_dir,
+                cache_max_bytes=self.config.tts_cache_max_bytes,
+                session=self._http_session
             )
         else:
             self.logger.error(f"Unknown TTS provider: {provider}")
@@ -206,179 +314,290 @@ class AudioTransmitterAgent(BaseAgent):
     async def start(self):
         """Start the transmitter threads."""
         self.logger.info("Starting AudioTransmitterAgent threads...")
+        self._start_transcription_watcher()
         self.generator_thread = threading.Thread(target=self._generate_response, daemon=True)
+        self.synthesizer_thread = threading.Thread(target=self._synthesize_responses, daemon=True)
         self.transmitter_thread = threading.Thread(target=self._transmit_responses, daemon=True)
         self.generator_thread.start()
+        self.synthesizer_thread.start()
         self.transmitter_thread.start()
 
     async def stop(self):
-        """Signal threads to stop and wait for them to join."""
+        """Signal threads to stop and wait for them to join off the event loop."""
         self.logger.info("Stopping AudioTransmitterAgent...")
         self.terminate_flag.set()
-        if self.generator_thread:
-            self.generator_thread.join()
-        if self.transmitter_thread:
-            self.transmitter_thread.join()
+        loop = asyncio.get_running_loop()
+        if self._observer:
+            self._observer.stop()
+            await loop.run_in_executor(None, self._observer.join)
+        player = self._current_player
+        if player and player.poll() is None:
+            player.terminate()
+        if self._output_stream is not None:
+            # Unblocks a write in progress on the transmitter thread
+            self._output_stream.abort()
+        # Consumers block without a timeout; a None wakes each one to see terminate_flag.
+        # A full queue means its consumer is busy and will check the flag on its own.
+        for q in (self._pending_files, self.response_queue, self.audio_queue):
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
+        # Threads may be mid-request; join in the executor so the loop keeps running
+        for thread in (self.generator_thread, self.synthesizer_thread, self.transmitter_thread):
+            if thread:
+                await loop.run_in_executor(None, thread.join)
+        self._tts_executor.shutdown(wait=False)
+        self._close_output_stream()
+        self._convo_log_fh.close()
+        os.close(self._lock_fd)
+        if self.semantic_cache:
+            self.semantic_cache.save()
+        self._http_session.close()
+        if self.client:
+            self.client.close()
         self.logger.info("AudioTransmitterAgent stopped.")
 
     def _generate_response(self):
-        """Continuously polls for new transcription files, decides if/how to respond, and enqueues responses."""
+        """Wait for new transcription files, decide if/how to respond, and enqueue responses."""
+        # Catch files that landed before the watcher was registered
+        self._queue_existing_transcriptions()
+        # inotify reports every close, so a file caught mid-write is queued again once it's
+        # finished; only the polling observer (which skips unsettled files) or no watcher at
+        # all needs the directory swept while idle
+        sweep_interval = None
+        if self._observer is None or self.config.transcriptions_watch_polling:
+            sweep_interval = IDLE_SWEEP_SECONDS
         while not self.terminate_flag.is_set():
-            new_transcriptions = self._load_new_transcriptions()
-            for timestamp, transcription, tool_response, filename in new_transcriptions:
-                filepath = os.path.join(self.config.transcriptions_dir, filename)
-                self.logger.info(f"New transcription: {transcription[:60]}...")
-
-                responding_persona = self._should_respond(transcription)
-                if responding_persona:
-                    self.logger.info(f"Transcription handled by persona '{responding_persona}'.")
-                    persona_data = self.personas[responding_persona]
-                    # Provider-specific voice
-                    voice = persona_data['voices'].get(
-                        self.config.tts_provider,
-                        self.config.default_voice
-                    )
-
-                    # Update conversation history
-                    self._update_conversation_history(timestamp, transcription, tool_response)
-                    # Build messages for GPT
-                    messages = self._prepare_chat_messages(persona_data)
-
-                    # -- TWO-PASS COMPLETION --
-                    # Pass #1: AI might produce SAY lines (immediate TTS) & TOOL_CALL
-                    first_pass_text = self._call_gpt4(messages, responding_persona, timestamp)
-
-                    # Parse that text line-by-line
-                    tool_result = None
-                    lines_pass1 = first_pass_text.splitlines()
-                    final_user_text_lines_pass1 = []
-                    for line in lines_pass1:
-                        line_stripped = line.strip()
-                        # if line_stripped.startswith("SAY:"):
-                            # Immediate TTS
-                            # say_text = line_stripped.replace("SAY:", "").strip()
-                            # self._speak_immediately(say_text)
-                            # continue
-                        if line_stripped.startswith("TOOL_CALL"):
-                            tool_result = self._invoke_tool(line_stripped)
-                            continue
-                        # Anything else is user text (but we might wait until pass #2 to finalize)
-                        final_user_text_lines_pass1.append(line_stripped)
-
-                    # If a tool was called, we append a TOOL_RESPONSE line to the conversation
-                    second_pass_text = ""
-                    if tool_result:
-                        # e.g. "TOOL_RESPONSE InventoryLookupTool: organic almond milk 10 in aisle 5"
-                        tool_resp_line = f"TOOL_RESPONSE {tool_result}"
-                        self.logger.info(f"Inserting tool response into conversation: {tool_resp_line}")
-                        self.conversation_history.append({
-                            'timestamp': datetime.now(tz=timestamp.tzinfo),
-                            'role': 'assistant',
-                            'content': tool_resp_line
-                        })
-                        # Rebuild messages with updated conversation
-                        messages2 = self._prepare_chat_messages(persona_data)
-                        # Pass #2: Final user-friendly text
-                        second_pass_text = self._call_gpt4(messages2, responding_persona, timestamp)
-
-                    # If second_pass_text is present, use that as final
-                    # else if there's leftover lines from pass1, we can treat them as final
-                    if second_pass_text:
-                        final_user_text = second_pass_text
-                    else:
-                        final_user_text = "\n".join(final_user_text_lines_pass1).strip()
+            try:
+                filename = self._pending_files.get(timeout=sweep_interval)
+            except queue.Empty:
+                self._queue_existing_transcriptions()
+                continue
+            # None is stop()'s wake-up; a dispatched name can come back from an overlapping
+            # event/sweep, or stay in the directory if moving it failed
+            if filename is None or filename in self._dispatched:
+                continue
+
+            entry = self._read_transcription(filename)
+            if entry:
+                self._dispatched.add(filename)
+                self._handle_transcription(*entry)
+
+    def _handle_transcription(self, timestamp, transcription, tool_response, filename):
+        """Respond to a single transcription and move its file to the processed folder."""
+        filepath = os.path.join(self.config.transcriptions_dir, filename)
+        self.logger.info(f"New transcription: {transcription[:60]}...")
+
+        responding_persona = self._should_respond(transcription)
+        if responding_persona:
+            self.logger.info(f"Transcription handled by persona '{responding_persona}'.")
+            persona_data = self.personas[responding_persona]
+            # Provider-specific voice
+            voice = persona_data['voices'].get(
+                self.config.tts_provider,
+                self.config.default_voice
+            )
 
-                    if final_user_text:
-                        # Enqueue the response for TTS & playback
-                        self.response_queue.put({'text': final_user_text, 'voice': voice})
-                        self._log_conversation(transcription, final_user_text, responding_persona)
+            # Update conversation history
+            self._update_conversation_history(timestamp, transcription, tool_response)
+            # Build messages for GPT
+            messages = self._prepare_chat_messages(persona_data)
+
+            # Sentences already handed to TTS while the completion was still streaming
+            spoken = []
+
+            def speak(sentence):
+                spoken.append(sentence)
+                self.response_queue.put(self._tts_executor.submit(self._text_to_speech, sentence, voice))
+
+            # A near-duplicate of an earlier turn can reuse that reply and skip GPT-4 entirely
+            query_embedding = self._embed(transcription) if self.semantic_cache else None
+            cached_reply = None
+            if query_embedding is not None:
+                cached_reply = self.semantic_cache.lookup(query_embedding, responding_persona)
+
+            # -- TWO-PASS COMPLETION --
+            # Pass #1: AI might produce SAY lines (immediate TTS) & TOOL_CALL.
+            # Only stream it for personas that use neither: a TOOL_CALL may supersede the pass #1
+            # text, and SAY lines are spoken by the loop below, so streaming would say them twice.
+            if cached_reply is not None:
+                first_pass_text = cached_reply
+                self._record_reply(cached_reply, responding_persona)
+            else:
+                plain = not (persona_data['_uses_tools'] or persona_data['_uses_say'])
+                first_pass_text = self._call_gpt4(
+                    messages, responding_persona,
+                    on_sentence=speak if plain else None
+                )
+
+            # Parse that text line-by-line
+            tool_result = None
+            lines_pass1 = first_pass_text.splitlines()
+            final_user_text_lines_pass1 = []
+            for line in lines_pass1:
+                line_stripped = line.strip()
+                if line_stripped.startswith("SAY:"):
+                    # Immediate TTS, played ahead of the final answer (e.g. "Copy, stand by.")
+                    say_text = line_stripped[len("SAY:"):].strip()
+                    if say_text:
+                        self._speak_immediately(say_text, voice)
+                    continue
+                if line_stripped.startswith("TOOL_CALL"):
+                    tool_result = self._invoke_tool(line_stripped)
+                    continue
+                # Anything else is user text (but we might wait until pass #2 to finalize)
+                final_user_text_lines_pass1.append(line_stripped)
+
+            # If a tool was called, we append a TOOL_RESPONSE line to the conversation
+            second_pass_text = ""
+            if tool_result:
+                direct = isinstance(tool_result, DirectReply)
+                # e.g. "TOOL_RESPONSE InventoryLookupTool: organic almond milk 10 in aisle 5"
+                tool_resp_line = f"TOOL_RESPONSE {tool_result.data if direct else tool_result}"
+                self.logger.info(f"Inserting tool response into conversation: {tool_resp_line}")
+                self._append_history(time.time(), 'assistant', tool_resp_line)
+                direct_reply = self._direct_reply(persona_data, tool_result) if direct else None
+                if direct_reply:
+                    # The persona's own template phrases the answer; skip the second GPT round trip
+                    second_pass_text = direct_reply
+                    self._record_reply(second_pass_text, responding_persona)
                 else:
-                    self.logger.info("No active persona or ignoring message.")
+                    # Rebuild messages with updated conversation
+                    messages2 = self._prepare_chat_messages(persona_data)
+                    # Pass #2: Final user-friendly text
+                    second_pass_text = self._call_gpt4(messages2, responding_persona, on_sentence=speak)
+
+            # If second_pass_text is present, use that as final
+            # else if there's leftover lines from pass1, we can treat them as final
+            if second_pass_text:
+                final_user_text = second_pass_text
+            else:
+                final_user_text = "\n".join(final_user_text_lines_pass1).strip()
 
-                # Move file to processed
-                self._move_processed_file(filepath, filename)
+            # Tool results are live data, so only plain replies are worth reusing
+            if final_user_text and not tool_result and cached_reply is None and query_embedding is not None:
+                self.semantic_cache.add(query_embedding, responding_persona, final_user_text)
 
-            time.sleep(1)
+            if final_user_text:
+                if not spoken:
+                    # Start TTS right away; the queue keeps the futures in reply order for playback
+                    speak(final_user_text)
+                self._log_conversation(transcription, final_user_text, responding_persona)
+        else:
+            self.logger.info("No active persona or ignoring message.")
+
+        # Move file to processed
+        self._move_processed_file(filepath, filename)
 
-    def _call_gpt4(self, messages, responding_persona, original_ts) -> str:
+    def _call_gpt4(self, messages, responding_persona, on_sentence=None) -> str:
         """
         Helper method to call GPT-4 and append the entire AI output to conversation history.
-        Returns the raw text from GPT-4 (not yet TTS or anything).
+        Returns the raw text from GPT-4 (not yet TTS or anything). If on_sentence is given,
+        the completion is streamed and each finished sentence is passed to it as it arrives.
         """
         if not self.client:
             self.logger.error("OpenAI client is not available.")
             return ""
 
         try:
-            completion = self.client.chat.completions.create(
-                model='gpt-4',
-                messages=messages
-            )
-            ai_text = completion.choices[0].message.content.strip()
-            self.transcription_logger.info(f"{responding_persona} | {ai_text}")
-
-            # Add entire AI text to conversation
-            self.conversation_history.append({
-                'timestamp': datetime.now(tz=original_ts.tzinfo),
-                'role': 'assistant',
-                'content': ai_text
-            })
-            self.assistant_responses.append(ai_text)
-            if len(self.assistant_responses) > 10:
-                self.assistant_responses = self.assistant_responses[-10:]
-
+            cache_key = self._completion_cache_key(messages) if self.config.chat_cache_size else None
+            ai_text = self._completion_cache.get(cache_key) if cache_key else None
+            if ai_text is not None:
+                self._completion_cache.move_to_end(cache_key)
+                self.logger.info("Reusing cached reply for identical conversation.")
+                if on_sentence:
+                    for chunk in split_for_speech(ai_text):
+                        on_sentence(chunk)
+            elif on_sentence:
+                ai_text = self._stream_gpt4(messages, on_sentence)
+            else:
+                completion = self.client.chat.completions.create(
+                    model='gpt-4',
+                    messages=messages
+                )
+                ai_text = completion.choices[0].message.content.strip()
+            if cache_key and ai_text:
+                self._completion_cache[cache_key] = ai_text
+                if len(self._completion_cache) > self.config.chat_cache_size:
+                    self._completion_cache.popitem(last=False)
+            self._record_reply(ai_text, responding_persona)
             return ai_text
         except Exception as e:
             self.logger.error(f"Error generating response (GPT-4): {e}")
             return ""
 
-    def _speak_immediately(self, text: str):
+    def _record_reply(self, ai_text, responding_persona):
+        """Log a reply and add it to the conversation history and echo filter."""
+        self.transcription_logger.info(f"{responding_persona} | {ai_text}")
+
+        # Add entire AI text to conversation
+        self._append_history(time.time(), 'assistant', ai_text)
+        self._remember_response(ai_text)
+
+    def _embed(self, text: str):
+        """Embed text for the semantic cache; None if the call fails."""
+        try:
+            response = self.client.embeddings.create(model='text-embedding-3-small', input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            self.logger.error(f"Error embedding transcription: {e}")
+            return None
+
+    @staticmethod
+    def _completion_cache_key(messages) -> bytes:
+        return hashlib.blake2b(json_codec.canonical(messages), digest_size=16).digest()
+
+    def _stream_gpt4(self, messages, on_sentence) -> str:
+        """Stream a GPT-4 completion, handing off each speakable chunk as soon as it's final."""
+        stream = self.client.chat.completions.create(
+            model='gpt-4',
+            messages=messages,
+            stream=True
+        )
+        parts = []
+        chunker = SpeechChunker()
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            for sentence in chunker.feed(delta):
+                on_sentence(sentence)
+        for sentence in chunker.flush():
+            on_sentence(sentence)
+        return "".join(parts).strip()
+
+    def _speak_immediately(self, text: str, voice: Optional[str]):
+        """
+        Queue a SAY line for TTS without waiting on it. Several SAY lines in one
+        reply synthesize concurrently on the TTS pool and still play in order,
+        ahead of the final answer.
+        """
         self.logger.info(f"Immediate TTS: {text}")
-        # If the active persona is known, use that persona's openai voice
-        voice = None
-        if self.active_persona:
-            persona_data = self.personas.get(self.active_persona, {})
-            voice = persona_data['voices'].get('openai', 'ash')  # fallback to 'ash'
-    
-        audio_file = self._text_to_speech(text, voice)
-        if audio_file:
-            self._play_audio(audio_file)
-    
-    def _invoke_tool(self, tool_line: str) -> str:
+        self.response_queue.put(self._tts_executor.submit(self._text_to_speech, text, voice))
+
+    def _invoke_tool(self, tool_line: str) -> Union[str, DirectReply]:
         """
         Example: "TOOL_CALL InventoryLookupTool: lookup organic almond milk"
-        We parse out the tool name and method, instantiate the tool, call the method,
+        We parse out the tool name and method, call the method on the registered tool,
         and return something like "InventoryLookupTool: organic almond milk 10 in aisle 5"
-        so we can feed it back as a TOOL_RESPONSE.
+        so we can feed it back as a TOOL_RESPONSE. Tools may return a DirectReply,
+        which comes back with the same prefix on its data and the tool name filled in.
         """
-        line_stripped = tool_line.strip()
-        if not line_stripped.startswith("TOOL_CALL"):
-            return "Invalid tool call."
-
-        # Remove "TOOL_CALL"
-        tool_line_inner = line_stripped[len("TOOL_CALL"):].strip()
-        # e.g. "InventoryLookupTool: lookup organic almond milk"
-
-        # Split on first colon
-        parts = tool_line_inner.split(":", 1)
-        if len(parts) < 2:
-            return "Invalid format, no colon found after tool name."
+        match = TOOL_CALL_RE.match(tool_line)
+        if not match:
+            if not tool_line.strip().startswith("TOOL_CALL"):
+                return "Invalid tool call."
+            return "Invalid format, expected 'TOOL_CALL <tool>: <method> <args>'."
 
-        tool_name = parts[0].strip()  # "InventoryLookupTool"
-        remainder = parts[1].strip()  # "lookup organic almond milk"
-
-        subparts = remainder.split(" ", 1)
-        if len(subparts) < 2:
-            return f"{tool_name}: no method args."
-
-        method_name = subparts[0].strip()  # "lookup"
-        method_args = subparts[1].strip()  # "organic almond milk"
+        # e.g. "InventoryLookupTool", "lookup", "organic almond milk"
+        tool_name, method_name, method_args = match.groups()
 
         if tool_name not in self.tools:
             return f"{tool_name}: not found in self.tools."
 
-        tool_class = self.tools[tool_name]
-        tool_instance = tool_class()
+        tool_instance = self.tools[tool_name]
 
         # Attempt to call the method
         if not hasattr(tool_instance, method_name):
@@ -389,49 +608,101 @@ class AudioTransmitterAgent(BaseAgent):
 
         # We'll return a single string we can feed back as a TOOL_RESPONSE
         # e.g. "InventoryLookupTool: organic almond milk 10 in aisle 5"
+        if isinstance(result, DirectReply):
+            return DirectReply(f"{tool_name}: {method_args} {result.data}", result.fields, tool_name)
         return f"{tool_name}: {method_args} {result}"
 
-    def _transmit_responses(self):
-        """Continuously pulls responses from queue, runs TTS, and plays the audio."""
+    def _direct_reply(self, persona_data, tool_result: DirectReply) -> Optional[str]:
+        """The persona's templated answer for this tool result, or None if it has no template."""
+        template = persona_data['direct_replies'].get(tool_result.tool)
+        if not template:
+            return None
+        try:
+            return template.format(**tool_result.fields)
+        except (KeyError, IndexError, ValueError) as e:
+            self.logger.error(f"Bad direct reply template for {tool_result.tool}: {e}")
+            return None
+
+    def _synthesize_responses(self):
+        """Resolve pending TTS futures in order, so the next clip is ready while the current one plays."""
         while not self.terminate_flag.is_set():
             try:
-                response_item = self.response_queue.get(timeout=1)
-                if response_item:
-                    response_text = response_item['text']
-                    voice = response_item['voice']
-                    audio_file = self._text_to_speech(response_text, voice)
+                tts_future = self.response_queue.get()
+                if tts_future:
+                    audio_file = tts_future.result()
                     if audio_file:
-                        self._play_audio(audio_file)
+                        self._enqueue_audio(audio_file)
                     else:
                         self.logger.error("Failed to convert text to speech.")
-            except queue.Empty:
+            except Exception as e:
+                self.logger.error(f"Error in synthesize_responses: {e}")
+
+    def _enqueue_audio(self, audio_file: str):
+        """Hand a synthesized clip to the player, waiting while the buffer is full."""
+        while not self.terminate_flag.is_set():
+            try:
+                self.audio_queue.put(audio_file, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _transmit_responses(self):
+        """
+        Continuously pulls synthesized clips from the audio queue and plays them.
+        The receiver stays locked across back-to-back clips; the release delay
+        doubles as a wait for the next clip, so a burst is one locked segment.
+        """
+        while not self.terminate_flag.is_set():
+            audio_file = self.audio_queue.get()
+            if audio_file is None:
                 continue
+
+            self._create_lock()
+            try:
+                while audio_file and not self.terminate_flag.is_set():
+                    self._play_clip(audio_file)
+                    try:
+                        audio_file = self.audio_queue.get(timeout=self.config.tx_release_delay)
+                    except queue.Empty:
+                        audio_file = None
             except Exception as e:
                 self.logger.error(f"Error in transmit_responses: {e}")
+            finally:
+                self._remove_lock()
+
+    def _remember_response(self, text: str):
+        """Track a reply for echo suppression, forgetting whatever falls off the deque."""
+        text = text.strip()
+        if len(self.assistant_responses) == self.assistant_responses.maxlen:
+            dropped = self.assistant_responses[0]
+            self._assistant_response_counts[dropped] -= 1
+            if not self._assistant_response_counts[dropped]:
+                del self._assistant_response_counts[dropped]
+        self.assistant_responses.append(text)
+        self._assistant_response_counts[text] += 1
 
     def _should_respond(self, transcription: str) -> Optional[str]:
         """Decide whether to respond based on activation phrases, persona timeouts, etc."""
         transcription_lower = transcription.lower()
 
         # Don’t respond if the message is exactly the same as a known assistant response
-        for resp in self.assistant_responses:
-            if transcription.strip() == resp.strip():
-                self.logger.info("Ignoring transcription that matches our own recent response.")
-                return None
+        if transcription.strip() in self._assistant_response_counts:
+            self.logger.info("Ignoring transcription that matches our own recent response.")
+            return None
 
         # Check for explicit activation
-        for persona_name, persona_data in self.personas.items():
-            for phrase in persona_data['activation_phrases']:
-                if phrase.lower() in transcription_lower:
-                    self.active_persona = persona_name
-                    self.last_interaction_time = datetime.now()
-                    self.logger.info(f"Activated persona '{self.active_persona}' via '{phrase}'.")
-                    return self.active_persona
+        phrase = self._match_activation(transcription_lower)
+        if phrase:
+            self.active_persona = self._activation_personas[phrase]
+            self.last_interaction_time = time.monotonic()
+            self.logger.info(f"Activated persona '{self.active_persona}' via '{phrase}'.")
+            return self.active_persona
 
         # If we already have an active persona, check conversation timeout
         if self.active_persona:
-            if datetime.now() - self.last_interaction_time <= self.CONVERSATION_TIMEOUT:
-                self.last_interaction_time = datetime.now()
+            now = time.monotonic()
+            if now - self.last_interaction_time <= self._timeout_seconds:
+                self.last_interaction_time = now
                 return self.active_persona
             else:
                 self.logger.info("Conversation timed out. No active persona.")
@@ -440,13 +711,13 @@ class AudioTransmitterAgent(BaseAgent):
         # If no active persona, but we only have one loaded, just use it
         if not self.active_persona and len(self.personas) == 1:
             self.active_persona = next(iter(self.personas))
-            self.last_interaction_time = datetime.now()
+            self.last_interaction_time = time.monotonic()
             self.logger.info(f"No activation phrase needed; defaulting to persona '{self.active_persona}'.")
             return self.active_persona
         elif not self.active_persona and len(self.personas) > 1:
             # If multiple are loaded, pick randomly
             self.active_persona = random.choice(list(self.personas.keys()))
-            self.last_interaction_time = datetime.now()
+            self.last_interaction_time = time.monotonic()
             self.logger.info(f"No activation phrase; randomly selected '{self.active_persona}'.")
             return self.active_persona
 
@@ -463,101 +734,275 @@ class AudioTransmitterAgent(BaseAgent):
             return {}
 
         try:
-            with open(persona_file, 'r') as f:
-                data = json.load(f)
+            with open(persona_file, 'rb') as f:
+                data = json_codec.loads(f.read())
             prompt = data.get('prompt', '')
             voices = data.get('voices', {})
             activation_phrases = data.get('activation_phrases', [])
 
-            # Check for duplicate activation phrases
-            for phrase in activation_phrases:
-                if phrase.lower() in self.activation_phrases_set:
-                    self.logger.error(f"Duplicate activation phrase '{phrase}' in persona '{persona_name}'.")
-                    continue
-                self.activation_phrases_set.add(phrase.lower())
-
             return {
                 'prompt': prompt,
+                'system_prompt': _static_prompt(prompt),
+                '_uses_time': '{military_time}' in prompt,
                 'voices': voices,
-                'activation_phrases': activation_phrases
+                'activation_phrases': activation_phrases,
+                # Tool name -> reply template, for tool results that need no second GPT pass
+                'direct_replies': data.get('direct_replies', {}),
+                '_uses_tools': 'TOOL_CALL' in prompt,
+                '_uses_say': 'SAY:' in prompt,
+                'activation_phrases_lower': [phrase.lower() for phrase in activation_phrases]
             }
         except Exception as e:
             self.logger.error(f"Error loading persona '{persona_name}': {e}")
             return {}
 
+    def _build_activation_matcher(self):
+        """
+        Map each lowercased activation phrase to its persona, in the order the old
+        persona-by-persona scan tried them, and build one matcher over all of them:
+        an Aho-Corasick automaton when pyahocorasick is installed, otherwise a regex.
+        """
+        self._activation_personas = {}
+        for persona_name, persona_data in self.personas.items():
+            for phrase in persona_data['activation_phrases_lower']:
+                if phrase:
+                    # First persona to claim a phrase keeps it, as with the old per-persona scan
+                    self._activation_personas.setdefault(phrase, persona_name)
+        if not self._activation_personas:
+            self._activation_pattern = None
+            return
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for rank, phrase in enumerate(self._activation_personas):
+                automaton.add_word(phrase, (rank, phrase))
+            automaton.make_automaton()
+            self._activation_pattern = automaton
+            return
+        self._activation_pattern = re.compile(
+            '|'.join(re.escape(phrase) for phrase in self._activation_personas))
+
+    def _match_activation(self, text: str) -> Optional[str]:
+        """
+        Return the activation phrase found in text that comes first in persona order
+        (profile order, then the order a persona lists its phrases), or None. This is
+        the phrase the old scan hit, wherever it sits in the text.
+        """
+        if self._activation_pattern is None:
+            return None
+        if ahocorasick is not None:
+            found = [value for _, value in self._activation_pattern.iter(text)]
+            return min(found)[1] if found else None
+        # The regex only answers "is any phrase here?", which is the common case to rule out
+        # cheaply; on a hit, the ordered scan decides which phrase wins
+        if not self._activation_pattern.search(text):
+            return None
+        for phrase in self._activation_personas:
+            if phrase in text:
+                return phrase
+        return None
+
     def _load_all_personas(self):
         """Scan the profiles folder and load all profiles."""
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
         profiles_dir = os.path.join(project_root, 'profiles')
         profile_dirs = [d for d in os.listdir(profiles_dir) if os.path.isdir(os.path.join(profiles_dir, d))]
 
-        for profile in profile_dirs:
-            persona_file = os.path.join(profiles_dir, profile, f"{profile}.json")
-            if os.path.exists(persona_file):
-                p_data = self._load_persona(profile)
-                if p_data:
-                    self.personas[profile] = p_data
+        profile_dirs = [
+            profile for profile in profile_dirs
+            if os.path.exists(os.path.join(profiles_dir, profile, f"{profile}.json"))
+        ]
+
+        # File reads are I/O-bound, so overlap them; merge in order on this thread
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self._load_persona, profile_dirs))
+        for profile, p_data in zip(profile_dirs, results):
+            self._register_persona(profile, p_data)
+
+    def _register_persona(self, persona_name: str, p_data):
+        """Add a loaded persona, reporting activation phrases already claimed by another."""
+        if not p_data:
+            return
+        for phrase in p_data['activation_phrases_lower']:
+            if phrase in self.activation_phrases_set:
+                self.logger.error(f"Duplicate activation phrase '{phrase}' in persona '{persona_name}'.")
+                continue
+            self.activation_phrases_set.add(phrase)
+        self.personas[persona_name] = p_data
+
+    def _start_transcription_watcher(self):
+        """Watch transcriptions_dir with inotify (via watchdog) so new files arrive as events."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+            from watchdog.observers.polling import PollingObserver
+        except ImportError:
+            self.logger.info("watchdog not installed; polling transcriptions directory every second.")
+            return
+
+        pending = self._pending_files
+
+        class _TranscriptionHandler(FileSystemEventHandler):
+            def on_closed(self, event):
+                if not event.is_directory and event.src_path.endswith('.json'):
+                    pending.put(os.path.basename(event.src_path))
+
+            def on_moved(self, event):
+                if not event.is_directory and event.dest_path.endswith('.json'):
+                    pending.put(os.path.basename(event.dest_path))
+
+        class _PollingTranscriptionHandler(_TranscriptionHandler):
+            # The polling emitter never reports closes, only snapshot differences, so a
+            # created/modified file may be half written; unsettled ones are left to the sweep
+            def on_created(self, event):
+                self._queue_if_settled(event)
+
+            def on_modified(self, event):
+                self._queue_if_settled(event)
+
+            @staticmethod
+            def _queue_if_settled(event):
+                if event.is_directory or not event.src_path.endswith('.json'):
+                    return
+                try:
+                    mtime = os.stat(event.src_path).st_mtime
+                except OSError:
+                    return
+                if time.time() - mtime >= TRANSCRIPTION_SETTLE_SECONDS:
+                    pending.put(os.path.basename(event.src_path))
+
+        # inotify does not see changes made by other hosts on NFS mounts
+        if self.config.transcriptions_watch_polling:
+            observer, handler = PollingObserver(timeout=30), _PollingTranscriptionHandler()
+        else:
+            observer, handler = Observer(), _TranscriptionHandler()
+        observer.schedule(handler, str(self.config.transcriptions_dir), recursive=False)
+        observer.start()
+        self._observer = observer
+
+    def _queue_existing_transcriptions(self):
+        """Queue any JSON files already sitting in the transcriptions directory."""
+        for filename in self._load_new_transcriptions():
+            self._pending_files.put(filename)
 
     def _load_new_transcriptions(self):
-        """Return list of (timestamp, transcription, tool_response, filename) for new JSON files."""
-        results = []
+        """
+        Return the sorted names of JSON files waiting to be handled. Handled files
+        are moved out of the directory, so whatever is left (minus files already
+        dispatched) is pending, whatever its mtime. Files that are still settling,
+        or failed to parse and haven't changed since, are left for a later sweep.
+        """
+        found = []
+        present = set()
+        settled_before = time.time() - TRANSCRIPTION_SETTLE_SECONDS
         try:
-            files = sorted(os.listdir(self.config.transcriptions_dir))
-            for filename in files:
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.config.transcriptions_dir, filename)
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        timestamp = datetime.fromisoformat(data['timestamp'])
-                        transcription = data['transcription']
-                        tool_response = data.get('tool_response')
-                        results.append((timestamp, transcription, tool_response, filename))
+            with os.scandir(self.config.transcriptions_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.json') or entry.name in self._dispatched:
+                        continue
+                    present.add(entry.name)
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_mtime > settled_before:
+                        continue
+                    if self._unreadable.get(entry.name) == (st.st_mtime_ns, st.st_size):
+                        continue
+                    found.append(entry.name)
         except Exception as e:
             self.logger.error(f"Error loading transcriptions: {e}")
-        return results
+            return []
+        # Forget unreadable files that were removed by hand
+        for name in self._unreadable.keys() - present:
+            del self._unreadable[name]
+        return sorted(found)
+
+    def _read_transcription(self, filename: str):
+        """Return (timestamp, transcription, tool_response, filename), or None if unreadable."""
+        filepath = os.path.join(self.config.transcriptions_dir, filename)
+        st = None
+        try:
+            with open(filepath, 'rb') as f:
+                # Taken before reading, so a write landing after it always counts as a change
+                st = os.fstat(f.fileno())
+                data = json_codec.loads(f.read())
+            timestamp = datetime.fromisoformat(data['timestamp'])
+            transcription = data['transcription']
+            tool_response = data.get('tool_response')
+        except FileNotFoundError:
+            # Already handled via an earlier event or sweep
+            self._unreadable.pop(filename, None)
+            return None
+        except Exception as e:
+            # Possibly caught mid-write; the sweep retries it once the file changes
+            self.logger.error(f"Error loading transcription {filename}: {e}")
+            try:
+                st = st or os.stat(filepath)
+                self._unreadable[filename] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                self._unreadable.pop(filename, None)
+            return None
+        self._unreadable.pop(filename, None)
+        return timestamp, transcription, tool_response, filename
+
+    def _check_processed_dir_device(self):
+        """Warn if processed files can't be renamed into place (every move would be a copy)."""
+        try:
+            src_dev = os.stat(self.config.transcriptions_dir).st_dev
+            dst_dev = os.stat(self.config.processed_transcriptions_dir).st_dev
+        except OSError as e:
+            self.logger.warning(f"Couldn't check transcription directories: {e}")
+            return
+        if src_dev != dst_dev:
+            self.logger.warning(
+                "Transcriptions and processed transcriptions are on different filesystems; "
+                "each processed file will be copied instead of renamed."
+            )
 
     def _move_processed_file(self, filepath: str, filename: str):
         """Move the processed JSON file to the processed folder."""
         processed_filepath = os.path.join(self.config.processed_transcriptions_dir, filename)
         try:
-            shutil.move(filepath, processed_filepath)
+            try:
+                # One atomic rename in the common case of both dirs on the same filesystem
+                os.replace(filepath, processed_filepath)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(filepath, processed_filepath)
+            self._dispatched.discard(filename)
             self.logger.info(f"Moved file {filename} to {processed_filepath}")
         except Exception as e:
             self.logger.error(f"Error moving file {filename}: {e}")
 
     def _update_conversation_history(self, timestamp, transcription, tool_response=None):
         """Append user & tool responses to conversation history, trim old messages."""
-        self.conversation_history.append({
-            'timestamp': timestamp,
-            'role': 'user',
-            'content': transcription
-        })
+        ts = timestamp.timestamp()
+        self._append_history(ts, 'user', transcription)
         if tool_response:
-            self.conversation_history.append({
-                'timestamp': timestamp,
-                'role': 'assistant',
-                'content': tool_response
-            })
+            self._append_history(ts, 'assistant', tool_response)
 
-        # Expire old messages
-        now = datetime.now(tz=timestamp.tzinfo)
-        cutoff_time = now - self.config.context_expiration
-        self.conversation_history = [m for m in self.conversation_history if m['timestamp'] >= cutoff_time]
+        # Expire old messages; they're appended in time order, so stale ones sit at the head
+        cutoff_ts = time.time() - self.config.context_expiration.total_seconds()
+        while self._hist_ts and self._hist_ts[0] < cutoff_ts:
+            self._hist_ts.popleft()
+            self._hist_role.popleft()
+            self._hist_content.popleft()
 
-        # Limit total conversation length
-        if len(self.conversation_history) > self.config.conversation_history_limit:
-            self.conversation_history = self.conversation_history[-self.config.conversation_history_limit:]
+    def _append_history(self, ts: float, role: str, content: str):
+        self._hist_ts.append(ts)
+        self._hist_role.append(role)
+        self._hist_content.append(content)
 
     def _prepare_chat_messages(self, persona_data):
         """Build messages array for GPT-based completions."""
-        system_prompt = persona_data['prompt'].format(military_time=self._get_military_time())
-        messages = [{'role': 'system', 'content': system_prompt}]
+        messages = [{'role': 'system', 'content': persona_data['system_prompt']}]
 
-        for msg in self.conversation_history:
+        for role, content in zip(self._hist_role, self._hist_content):
             messages.append({
-                'role': msg['role'],
-                'content': msg['content']
+                'role': role,
+                'content': content
             })
+        if persona_data['_uses_time']:
+            # Volatile, so it goes last and never breaks the cached prefix
+            messages.append({'role': 'system', 'content': f"Current time: {self._get_military_time()}"})
         return messages
 
     def _text_to_speech(self, text: str, voice_id: Optional[str]):
@@ -567,12 +1012,10 @@ class AudioTransmitterAgent(BaseAgent):
         if not self.tts_service:
             self.logger.error("No TTS service configured!")
             return None
-        return self.tts_service.synthesize_text(text, voice_id, debug_mode=self.debug_mode)
+        return self.tts_service.synthesize_cached(text, voice_id, debug_mode=self.debug_mode)
 
-    def _play_audio(self, audio_file: str):
-        """Lock the receiver, play the audio, then unlock. Optionally remove the file if not debug."""
-        self.logger.info(f"Playing audio: {audio_file} on device: {self.config.audio_device}")
-        self._create_lock()
+    def _play_clip(self, audio_file: str):
+        """Play one clip to completion (no locking). Optionally remove the file if not debug."""
         try:
             _, ext = os.path.splitext(audio_file)
             ext = ext.lower()
@@ -583,34 +1026,85 @@ class AudioTransmitterAgent(BaseAgent):
             else:
                 self.logger.error(f"Unsupported audio format: {ext}")
                 return
-            subprocess.run(player, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.logger.info("Audio playback completed.")
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Error playing audio: {e}")
+            if self.config.playback_backend == 'sounddevice' and self._play_through_stream(audio_file):
+                return
+            self.logger.info(f"Playing audio: {audio_file} on device: {self.config.audio_device}")
+            # Keep a handle so stop() can cut playback short
+            self._current_player = subprocess.Popen(player, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            returncode = self._current_player.wait()
+            if returncode == 0:
+                self.logger.info("Audio playback completed.")
+            else:
+                self.logger.error(f"Error playing audio: {player[0]} exited with status {returncode}")
         finally:
-            time.sleep(1.5)
-            self._remove_lock()
-            if not self.debug_mode and os.path.exists(audio_file):
+            self._current_player = None
+            cached = self.tts_service is not None and self.tts_service.is_cached_file(audio_file)
+            if cached:
+                # Played, so the cache may evict it again
+                self.tts_service.release_clip(audio_file)
+            elif not self.debug_mode and os.path.exists(audio_file):
                 os.remove(audio_file)
                 self.logger.info(f"Removed temporary audio file: {audio_file}")
 
+    def _play_through_stream(self, audio_file: str) -> bool:
+        """
+        Write the clip to the persistent output stream. Returns False if the clip
+        can't be decoded or the device can't be opened, so the caller falls back
+        to spawning aplay/mpg123.
+        """
+        try:
+            data, samplerate = sf.read(audio_file, dtype='float32', always_2d=True)
+        except Exception as e:
+            self.logger.warning(f"Can't decode {audio_file} for streaming; using external player: {e}")
+            return False
+        try:
+            stream = self._get_output_stream(samplerate, data.shape[1])
+        except Exception as e:
+            self.logger.warning(f"Can't open output device {self.config.device_index}; using external player: {e}")
+            return False
+        self.logger.info(f"Playing audio: {audio_file} on output device: {self.config.device_index}")
+        try:
+            stream.write(data)
+            self.logger.info("Audio playback completed.")
+        except Exception as e:
+            self.logger.error(f"Error playing audio: {e}")
+        return True
+
+    def _get_output_stream(self, samplerate: int, channels: int):
+        """Return the open output stream, reopening it only if the clip format changed."""
+        if self._output_stream is not None and self._output_format == (samplerate, channels):
+            return self._output_stream
+        self._close_output_stream()
+        stream = sd.OutputStream(
+            samplerate=samplerate,
+            channels=channels,
+            device=self.config.device_index,
+            dtype='float32'
+        )
+        stream.start()
+        self._output_stream, self._output_format = stream, (samplerate, channels)
+        return stream
+
+    def _close_output_stream(self):
+        if self._output_stream is not None:
+            self._output_stream.abort()
+            self._output_stream.close()
+            self._output_stream, self._output_format = None, None
+
     def _log_conversation(self, transcription, response, persona_name):
         """Log the conversation to a single file, including the persona name."""
-        with open(CONVERSATION_LOG_FILE, "a") as f:
-            f.write(f"User: {transcription}\n")
-            f.write(f"{persona_name}: {response}\n")
-            f.write("-" * 40 + "\n")
+        # One write per turn, so the line-buffered handle flushes once rather than per line
+        self._convo_log_fh.write(f"User: {transcription}\n{persona_name}: {response}\n{'-' * 40}\n")
 
     def _create_lock(self):
-        """Create a lock file to signal the receiver to pause."""
-        with open(LOCK_FILE, 'w') as f:
-            f.write('locked')
+        """Signal the receiver to pause: set tx_active and take an exclusive flock for other processes."""
+        self.tx_active.set()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
 
     def _remove_lock(self):
-        """Remove the lock file to signal the receiver to resume after a small delay."""
-        if os.path.exists(LOCK_FILE):
-            time.sleep(1)
-            os.remove(LOCK_FILE)
+        """Release the flock and clear tx_active so the receiver resumes."""
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        self.tx_active.clear()
 
     def _get_military_time(self):
         return datetime.now().strftime('%H:%M')
@@ -1,6 +1,15 @@
 # src/core_dispatch/agent_framework/tools/tool_inventory_lookup.py
 
 import difflib
+import functools
+
+from core_dispatch.agent_framework.tools.tool_result import DirectReply
+
+# rapidfuzz is an optional speedup for fuzzy item matching; difflib is the fallback
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
 
 class InventoryLookupTool:
     """
@@ -26,12 +35,17 @@ class InventoryLookupTool:
                 "discontinued": True  # Seasonally discontinued
             }
         }
+        self._inventory_keys = list(self.inventory)
+        # Callers tend to ask about the same few items; remember where their names resolved
+        self._closest_item = functools.lru_cache(maxsize=128)(self._find_closest_item)
 
-    def lookup(self, item_name: str) -> str:
+    def lookup(self, item_name: str):
         """
         Return a short, plain-text description of the inventory result,
         or 'not_found' if unavailable.
 
+        An exact hit on an in-stock item comes back as a DirectReply (item,
+        quantity, aisle), since there's nothing left for the model to interpret.
         Also attempts fuzzy matching if an exact match is not found.
         """
         item_lower = item_name.lower()
@@ -39,18 +53,31 @@ class InventoryLookupTool:
         # 1) Direct exact match
         if item_lower in self.inventory:
             data = self.inventory[item_lower]
-            return self._format_inventory_response(item_lower, data)
+            text = self._format_inventory_response(item_lower, data)
+            if data.get("discontinued", False):
+                return text
+            return DirectReply(
+                data=text,
+                fields={'item': item_lower, 'quantity': data['quantity'], 'aisle': data['aisle']}
+            )
 
         # 2) Fuzzy match if no exact match
-        # Try to find the closest key in self.inventory, cutoff=0.6 is arbitrary
-        close_matches = difflib.get_close_matches(item_lower, self.inventory.keys(), n=1, cutoff=0.6)
-        if close_matches:
-            matched_item = close_matches[0]
+        matched_item = self._closest_item(item_lower)
+        if matched_item:
             data = self.inventory[matched_item]
             return self._format_inventory_response(matched_item, data)
 
         return "not_found"
 
+    def _find_closest_item(self, item_lower: str):
+        """Return the closest inventory key, or None. The 0.6 similarity cutoff is arbitrary."""
+        if process is not None:
+            # fuzz.ratio is the closest analogue of difflib's ratio, on a 0-100 scale
+            match = process.extractOne(item_lower, self._inventory_keys, scorer=fuzz.ratio, score_cutoff=60)
+            return match[0] if match else None
+        close_matches = difflib.get_close_matches(item_lower, self._inventory_keys, n=1, cutoff=0.6)
+        return close_matches[0] if close_matches else None
+
     def _format_inventory_response(self, item: str, data: dict) -> str:
         """
         Helper method to format the response string for the user.
@@ -0,0 +1,19 @@
+# src/core_dispatch/agent_framework/tools/tool_result.py
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class DirectReply:
+    """
+    A tool result complete enough to answer the user without the model.
+    `data` is what goes back into the conversation as the TOOL_RESPONSE;
+    `fields` fill in the persona's template for this tool ("direct_replies"
+    in its JSON), so a persona that has one skips the second GPT pass and
+    keeps its own voice. Personas without a template, and tools that return
+    a plain string, keep the normal two-pass flow.
+    """
+    data: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+    tool: str = ""
@@ -0,0 +1,30 @@
+# src/core_dispatch/agent_framework/utils/json_codec.py
+
+import json
+
+# orjson is an optional speedup; fall back to the stdlib encoder when it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def canonical(obj) -> bytes:
+    """Serialize obj compactly with sorted keys, e.g. for hashing."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes):
+    """Parse JSON from bytes (or str)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
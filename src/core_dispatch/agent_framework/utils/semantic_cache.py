@@ -0,0 +1,130 @@
+# src/core_dispatch/agent_framework/utils/semantic_cache.py
+
+import os
+import logging
+import numpy as np
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Reuses replies for near-duplicate user turns ("turn on the lights" vs
+    "turn the lights on"). Entries are (embedding, persona, reply); a lookup
+    returns the reply of the most similar entry for the same persona if its
+    cosine similarity clears the threshold. Least recently used entries are
+    overwritten once the cache is full, and the cache is saved to an .npz
+    file so it survives restarts.
+
+    Not thread-safe; the transmitter only touches it from the generator thread.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.92, capacity: int = 512):
+        self.path = str(path)
+        self.threshold = threshold
+        self.capacity = capacity
+        self._vecs = None           # (N, D) float32, rows normalized to unit length
+        self._personas = np.empty(0, dtype=object)
+        self._replies = []
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._clock = 0
+        self._load()
+
+    def lookup(self, embedding, persona: str) -> Optional[str]:
+        """Return the cached reply closest to embedding for this persona, or None."""
+        query = self._normalize(embedding)
+        self._check_dimension(query)
+        if self._vecs is None:
+            return None
+        candidates = np.flatnonzero(self._personas == persona)
+        if not len(candidates):
+            return None
+        scores = self._vecs[candidates] @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        idx = candidates[best]
+        self._touch(idx)
+        logger.info(f"Semantic cache hit (similarity {scores[best]:.3f}).")
+        return self._replies[idx]
+
+    def add(self, embedding, persona: str, reply: str):
+        """Store a reply, replacing the least recently used entry when full."""
+        vec = self._normalize(embedding)
+        self._check_dimension(vec)
+        if self._vecs is None:
+            self._vecs = vec[np.newaxis, :]
+        elif len(self._replies) < self.capacity:
+            self._vecs = np.vstack((self._vecs, vec))
+        else:
+            idx = int(np.argmin(self._last_used))
+            self._vecs[idx] = vec
+            self._personas[idx] = persona
+            self._replies[idx] = reply
+            self._touch(idx)
+            return
+        self._personas = np.append(self._personas, np.array([persona], dtype=object))
+        self._replies.append(reply)
+        self._last_used = np.append(self._last_used, 0)
+        self._touch(len(self._replies) - 1)
+
+    def save(self):
+        """Write the cache to disk (atomically) so the next run starts warm."""
+        if self._vecs is None:
+            return
+        tmp_path = self.path + '.tmp.npz'
+        try:
+            np.savez(
+                tmp_path,
+                vecs=self._vecs,
+                personas=np.array(self._personas, dtype=str),
+                replies=np.array(self._replies, dtype=str),
+                last_used=self._last_used
+            )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save semantic cache: {e}")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                vecs = data['vecs'].astype(np.float32)
+                personas = data['personas'].astype(object)
+                replies = data['replies'].tolist()
+                last_used = data['last_used'].astype(np.int64)
+        except Exception as e:
+            logger.error(f"Ignoring unreadable semantic cache {self.path}: {e}")
+            return
+        # Keep the most recently used entries if the capacity shrank
+        keep = np.sort(np.argsort(last_used)[::-1][:self.capacity])
+        self._vecs = vecs[keep] if len(keep) else None
+        self._personas = personas[keep]
+        self._replies = [replies[i] for i in keep]
+        self._last_used = last_used[keep]
+        self._clock = int(last_used.max()) if len(last_used) else 0
+
+    def _check_dimension(self, vec: np.ndarray):
+        """Drop every entry if they came from an embedding model of a different width."""
+        if self._vecs is None or self._vecs.shape[1] == vec.shape[0]:
+            return
+        logger.warning(
+            f"Embedding size changed from {self._vecs.shape[1]} to {vec.shape[0]}; "
+            f"discarding {len(self._replies)} semantic cache entries."
+        )
+        self._vecs = None
+        self._personas = np.empty(0, dtype=object)
+        self._replies = []
+        self._last_used = np.empty(0, dtype=np.int64)
+
+    def _touch(self, idx: int):
+        self._clock += 1
+        self._last_used[idx] = self._clock
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
@@ -0,0 +1,93 @@
+# src/core_dispatch/agent_framework/utils/speech_chunker.py
+
+import re
+from typing import List
+
+# Shorter pieces are merged with a neighbour rather than synthesized as a clip of their own
+MIN_CHUNK_CHARS = 40
+
+# Where a reply can be cut: whitespace after terminal punctuation, or a line break
+_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+# Initials and dotted abbreviations ("J.", "U.S.", "e.g.")
+_INITIALS = re.compile(r'(?:[A-Za-z]\.)+$')
+_ABBREVIATIONS = frozenset({
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'st.', 'jr.', 'sr.', 'vs.', 'etc.',
+    'approx.', 'no.', 'sgt.', 'lt.', 'capt.', 'col.', 'gen.', 'cpl.', 'pvt.',
+    'ave.', 'blvd.', 'dept.', 'est.', 'min.', 'max.',
+})
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    words = text.rsplit(None, 1)
+    if not words:
+        return False
+    word = words[-1]
+    return word.lower() in _ABBREVIATIONS or bool(_INITIALS.match(word))
+
+
+class SpeechChunker:
+    """
+    Cuts streamed reply text into pieces worth one TTS request each.
+    Sentences end at terminal punctuation followed by whitespace (not after
+    "Mr." or "U.S.") or at a line break. A piece is only released once the
+    sentence after it has arrived, so a short follow-up such as the "Over."
+    sign-off joins the piece before it instead of becoming its own clip;
+    short leading sentences likewise wait for the next one.
+    """
+
+    def __init__(self, min_chars: int = MIN_CHUNK_CHARS):
+        self.min_chars = min_chars
+        self._pending = ""  # text after the last cut
+        self._building = ""  # sentences not yet long enough to stand alone
+        self._held = ""  # a full-length piece, waiting to see what follows it
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the pieces that are now final."""
+        self._pending += text
+        ready = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._pending):
+            sentence = self._pending[start:match.start()]
+            if not match.group(0).startswith('\n') and _ends_with_abbreviation(sentence):
+                continue
+            start = match.end()
+            self._add_sentence(sentence, ready)
+        self._pending = self._pending[start:]
+        return ready
+
+    def flush(self) -> List[str]:
+        """End of the reply: return whatever is left."""
+        ready = []
+        self._add_sentence(self._pending, ready)
+        self._pending = ""
+        if self._building:
+            # Too short to stand alone; attach it to the held piece if there is one
+            self._held = self._join(self._held, self._building)
+            self._building = ""
+        if self._held:
+            ready.append(self._held)
+            self._held = ""
+        return ready
+
+    def _add_sentence(self, sentence: str, ready: List[str]):
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        if self._held and len(sentence) < self.min_chars and not self._building:
+            self._held = self._join(self._held, sentence)
+            return
+        self._building = self._join(self._building, sentence)
+        if len(self._building) >= self.min_chars:
+            if self._held:
+                ready.append(self._held)
+            self._held, self._building = self._building, ""
+
+    @staticmethod
+    def _join(first: str, second: str) -> str:
+        return f"{first} {second}" if first else second
+
+
+def split_for_speech(text: str, min_chars: int = MIN_CHUNK_CHARS) -> List[str]:
+    """Cut a complete reply into the same pieces SpeechChunker would stream."""
+    chunker = SpeechChunker(min_chars)
+    return chunker.feed(text) + chunker.flush()
@@ -1,20 +1,166 @@
 # src/core_dispatch/agent_framework/utils/tts_service.py
 
 import os
+import shutil
+import hashlib
 import logging
-import subprocess
+import tempfile
+import threading
 import requests
+from collections import Counter, OrderedDict
 from datetime import datetime
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
 
 class BaseTTSService:
-    """Base abstract TTS service."""
+    """
+    Base abstract TTS service.
+    Synthesized clips are kept in a content-addressed cache under
+    <tts_audio_dir>/cache, so repeated phrases (call signs, "Copy that")
+    skip the provider entirely, including across restarts.
+    """
+    provider = 'base'
+    file_extension = '.wav'
+
+    def __init__(self, tts_audio_dir: str, cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.tts_audio_dir = tts_audio_dir
+        self.cache_max_bytes = cache_max_bytes
+        self._cache_dir = os.path.join(tts_audio_dir, 'cache')
+        self._cache_lock = threading.Lock()
+        # LRU index of cached clips (path -> size in bytes), oldest first, and their total.
+        # Read from disk once here and kept current afterwards, so a miss never rescans the cache.
+        self._cache_entries = OrderedDict()
+        self._cache_bytes = 0
+        # Cached clips handed out by synthesize_cached() and not yet released; never evicted
+        self._pinned = Counter()
+        self._load_cache_index()
+
     def synthesize_text(self, text: str, voice: str, debug_mode: bool = False) -> Optional[str]:
         raise NotImplementedError
 
+    def synthesize_cached(self, text: str, voice: str, debug_mode: bool = False) -> Optional[str]:
+        """
+        Return a clip for (text, voice), reusing a cached synthesis when one exists.
+        A cached clip stays pinned until it's passed to release_clip() after playback.
+        """
+        cached = self._cache_path(text, voice)
+        hit = False
+        with self._cache_lock:
+            if cached in self._cache_entries:
+                hit = os.path.exists(cached)
+                if hit:
+                    self._cache_entries.move_to_end(cached)
+                    self._pinned[cached] += 1
+                else:
+                    # Removed behind our back
+                    self._cache_bytes -= self._cache_entries.pop(cached)
+        if hit:
+            # Bump the timestamp so the LRU order survives a restart
+            os.utime(cached)
+            logger.debug(f"TTS cache hit: {cached}")
+            return cached
+
+        audio_file = self.synthesize_text(text, voice, debug_mode=debug_mode)
+        if audio_file:
+            self._store_in_cache(audio_file, cached)
+        return audio_file
+
+    def _new_audio_path(self, ext: str, debug_mode: bool) -> str:
+        """
+        Create a uniquely named, empty file for one synthesis. Concurrent
+        syntheses can finish within the same second, and a finished clip may
+        already be hardlinked into the cache, so no clip path is ever reused.
+        """
+        # Same filesystem as the cache, so storing the clip is a hardlink rather than a copy
+        os.makedirs(self.tts_audio_dir, exist_ok=True)
+        if debug_mode:
+            # Kept for inspection; the timestamp prefix keeps them in order
+            prefix = f"response_{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+        else:
+            prefix = 'temp_response_'
+        fd, path = tempfile.mkstemp(prefix=prefix, suffix=ext, dir=self.tts_audio_dir)
+        os.close(fd)
+        return path
+
+    def is_cached_file(self, path: str) -> bool:
+        """True if path lives in the clip cache (callers must not delete it)."""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self._cache_dir)
+
+    def release_clip(self, path: str):
+        """Unpin a cached clip from synthesize_cached() once it has played (or been dropped)."""
+        with self._cache_lock:
+            if path in self._pinned:
+                self._pinned[path] -= 1
+                if not self._pinned[path]:
+                    del self._pinned[path]
+
+    def _cache_path(self, text: str, voice: str) -> str:
+        """Cache location for a clip; whitespace and case variants of the text share an entry."""
+        normalized = ' '.join(text.split()).lower()
+        key = hashlib.sha256(f"{self.provider}|{voice}|{normalized}".encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_dir, key + self.file_extension)
+
+    def _load_cache_index(self):
+        """Index the clips already on disk, least recently used first."""
+        entries = []
+        try:
+            with os.scandir(self._cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime, entry.path, st.st_size))
+        except FileNotFoundError:
+            return
+        for _, path, size in sorted(entries):
+            self._cache_entries[path] = size
+            self._cache_bytes += size
+
+    def _store_in_cache(self, audio_file: str, cached: str):
+        """Link (or copy) a fresh clip into the cache, then trim the cache to its byte budget."""
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            try:
+                os.link(audio_file, cached)
+            except FileExistsError:
+                # Another worker cached the same text first
+                return
+            except OSError:
+                # No hardlink support
+                shutil.copyfile(audio_file, cached)
+            size = os.path.getsize(cached)
+        except OSError as e:
+            logger.error(f"Failed to cache TTS clip: {e}")
+            return
+        with self._cache_lock:
+            self._cache_entries[cached] = size
+            self._cache_bytes += size
+            self._evict_cache()
+
+    def _evict_cache(self):
+        """
+        Delete the least recently used clips until the cache fits in cache_max_bytes,
+        skipping pinned ones still waiting to play. Called with _cache_lock held.
+        """
+        if self._cache_bytes <= self.cache_max_bytes:
+            return
+        for path in list(self._cache_entries):
+            if self._cache_bytes <= self.cache_max_bytes:
+                break
+            if path in self._pinned:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to evict cached TTS clip {path}: {e}")
+                continue
+            self._cache_bytes -= self._cache_entries.pop(path)
+
 
 class OpenAITTSService(BaseTTSService):
     """
@@ -22,34 +168,33 @@ class OpenAITTSService(BaseTTSService):
     If you have a specialized TTSOpenAI client object, pass it in the constructor
     or instantiate it here. In your original code, it was `client.audio.speech.create(...)`.
     """
-    def __init__(self, client, tts_audio_dir: str):
+    provider = 'openai'
+
+    def __init__(self, client, tts_audio_dir: str, cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        super().__init__(tts_audio_dir, cache_max_bytes)
         self.client = client
-        self.tts_audio_dir = tts_audio_dir
 
     def synthesize_text(self, text: str, voice: str, debug_mode: bool = False) -> Optional[str]:
-        temp_audio_file = 'temp_response.wav'
+        audio_file = self._new_audio_path('.wav', debug_mode)
         try:
-            # Original: response = client.audio.speech.create(model='tts-1', voice=provider_voice, ...)
-            response = self.client.audio.speech.create(
+            # Stream chunks straight to their final location as they arrive,
+            # rather than buffering the whole body and renaming afterwards
+            with self.client.audio.speech.with_streaming_response.create(
                 model='tts-1',
                 voice=voice,
                 input=text,
                 response_format='wav'
-            )
-            response.stream_to_file(temp_audio_file)
+            ) as response:
+                response.stream_to_file(audio_file)
 
             if debug_mode:
-                os.makedirs(self.tts_audio_dir, exist_ok=True)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                debug_audio_file = os.path.join(self.tts_audio_dir, f'response_{timestamp}.wav')
-                os.rename(temp_audio_file, debug_audio_file)
-                logger.info(f"Saved TTS audio to {debug_audio_file}")
-                return debug_audio_file
-
-            return temp_audio_file
+                logger.info(f"Saved TTS audio to {audio_file}")
+            return audio_file
 
         except Exception as e:
             logger.error(f"OpenAITTSService error: {e}")
+            if os.path.exists(audio_file):
+                os.remove(audio_file)
             return None
 
 
@@ -57,16 +202,22 @@ class UnrealSpeechTTSService(BaseTTSService):
     """
     Integrates with UnrealSpeech at https://api.v7.unrealspeech.com/stream
     """
-    def __init__(self, api_key: str, tts_audio_dir: str):
+    provider = 'unrealspeech'
+    file_extension = '.mp3'
+
+    def __init__(self, api_key: str, tts_audio_dir: str, cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 session: Optional[requests.Session] = None):
+        super().__init__(tts_audio_dir, cache_max_bytes)
         self.api_key = api_key
-        self.tts_audio_dir = tts_audio_dir
+        # Reuse keep-alive connections instead of a fresh TCP/TLS handshake per request.
+        # The session may be shared, so the API key goes on each request, never on the session.
+        self._session = session or requests.Session()
 
     def synthesize_text(self, text: str, voice: str, debug_mode: bool = False) -> Optional[str]:
         if not self.api_key:
             logger.error("UnrealSpeech API key is not set. Please provide it.")
             return None
 
-        temp_audio_file = 'temp_response.wav'
         url = 'https://api.v7.unrealspeech.com/stream'
         headers = {'Authorization': f'Bearer {self.api_key}'}
         data = {
@@ -78,25 +229,16 @@ class UnrealSpeechTTSService(BaseTTSService):
             'Codec': 'libmp3lame'
         }
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = self._session.post(url, headers=headers, json=data)
             if response.status_code == 200:
-                temp_mp3_file = 'temp_response.mp3'
-                with open(temp_mp3_file, 'wb') as f:
+                # The transmitter plays MP3 natively, so skip the ffmpeg WAV round-trip
+                audio_file = self._new_audio_path('.mp3', debug_mode)
+                with open(audio_file, 'wb') as f:
                     f.write(response.content)
-                # Convert MP3 to WAV
-                command = ['ffmpeg', '-y', '-i', temp_mp3_file, temp_audio_file]
-                subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                os.remove(temp_mp3_file)
 
                 if debug_mode:
-                    os.makedirs(self.tts_audio_dir, exist_ok=True)
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    debug_audio_file = os.path.join(self.tts_audio_dir, f"response_{timestamp}.wav")
-                    os.rename(temp_audio_file, debug_audio_file)
-                    logger.info(f"Saved TTS audio to {debug_audio_file}")
-                    return debug_audio_file
-
-                return temp_audio_file
+                    logger.info(f"Saved TTS audio to {audio_file}")
+                return audio_file
 
             else:
                 logger.error(f"UnrealSpeech request failed: {response.status_code} - {response.text}")
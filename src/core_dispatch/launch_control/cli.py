@@ -1,45 +1,18 @@
 import asyncio
+import functools
 import logging
 import os
+import queue
+import signal
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Tuple
 
 import click
 
-from core_dispatch.agent_framework.audio.receiver import AudioReceiverAgent, AudioConfig
-from core_dispatch.agent_framework.audio.transmitter import AudioTransmitterAgent, AudioTransmitterConfig
-from core_dispatch.launch_control.config.settings import (
-    LOGS_DIR,
-    SAMPLE_RATE,
-    CHANNELS,
-    AUDIO_DEVICE_INDEX,
-    AUDIO_THRESHOLD,
-    SILENCE_THRESHOLD,
-    MIN_RECORDING_DURATION,
-    MAX_RECORDING_DURATION,
-    PRE_ROLL_DURATION,
-    POST_ROLL_DURATION,
-    TRANSCRIPTION_SERVICE_TYPE,
-    OPENAI_API_KEY,
-    GOOGLE_CLOUD_PROJECT,
-    TX_SAMPLE_RATE,
-    TX_CHANNELS,
-    TX_AUDIO_DEVICE_INDEX,
-    AUDIO_DEVICE,
-    PROCESSED_FILES_JSON,
-    TTS_AUDIO_DIR,
-    CONTEXT_EXPIRATION,
-    RESPONSE_QUEUE_MAX_SIZE,
-    CONVERSATION_HISTORY_LIMIT,
-    TX_LOG_FILE,
-    LOG_FORMAT,
-    TRANSCRIPTIONS_DIR,
-    PROCESSED_TRANSCRIPTIONS_DIR,
-    TRANSCRIPTIONS_LOG_FILE,
-    TTS_PROVIDER,
-    UNREALSPEECH_API_KEY,
-    DEFAULT_VOICE,
-)
+# Persona profiles live in src/core_dispatch/personas; resolved once rather than per lookup
+_PROFILES_DIR = Path(__file__).resolve().parent.parent / "personas"
 
 
 @click.group()
@@ -51,45 +24,105 @@ def cli():
     """
     pass
 
+def _configure_logging(debug: bool, log_format: str, *handlers) -> QueueListener:
+    """
+    Route root logging through a queue so the event loop and agent threads
+    never block on file or console writes; a listener thread owns the handlers.
+    The caller stops the returned listener on exit to flush what's queued.
+    """
+    # No log format uses thread or pid fields, so don't collect them per record.
+    # logMultiprocessing stays on: the transcription log prints %(processName)s.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.raiseExceptions = False
+
+    log_queue = queue.SimpleQueue()
+    # Records are formatted once on the QueueHandler, so the handlers just emit the finished line
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter(log_format))
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, handlers=[queue_handler])
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+def _run_event_loop(main):
+    """Run the main() coroutine on uvloop when it's installed, else on the stock asyncio loop."""
+    async def _main():
+        # Python 3.12+: tasks that finish without suspending skip the scheduler round trip
+        if hasattr(asyncio, 'eager_task_factory'):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        await main()
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(_main())
+    if hasattr(uvloop, 'run'):
+        return uvloop.run(_main())
+    # uvloop < 0.18
+    uvloop.install()
+    return asyncio.run(_main())
+
+def _log_file_handler(path) -> RotatingFileHandler:
+    """Size-capped log file that isn't opened until the first record is written."""
+    return RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=3, delay=True)
+
+def _setting(name: str):
+    """
+    Click default that reads a value from settings when the command runs,
+    so --help still doesn't import the settings module.
+    """
+    def default():
+        from core_dispatch.launch_control.config import settings
+        return getattr(settings, name)
+    return default
+
+async def _wait_for_exit_signal():
+    """Sleep until SIGINT or SIGTERM arrives, without waking the loop in between."""
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    signals = (signal.SIGINT, signal.SIGTERM)
+    for sig in signals:
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        await stop_event.wait()
+    finally:
+        # A second Ctrl+C during cleanup falls back to KeyboardInterrupt
+        for sig in signals:
+            loop.remove_signal_handler(sig)
+    click.echo("\nReceived exit signal. Cleaning up...")
+
 @cli.command()
 @click.option('--debug', is_flag=True, default=False, help='Enable debug logging')
-def receiver(debug):  # pragma: no cover
+@click.option('--device-index', type=int, default=_setting('AUDIO_DEVICE_INDEX'),
+              show_default='AUDIO_DEVICE_INDEX', help='Input device to record from')
+@click.option('--sample-rate', type=int, default=_setting('SAMPLE_RATE'),
+              show_default='SAMPLE_RATE', help='Recording sample rate in Hz')
+def receiver(debug, device_index, sample_rate):  # pragma: no cover
     """Start the audio receiver service."""
+    # Imported here so --help and the other command don't load the audio stack
+    from core_dispatch.agent_framework.audio.receiver import AudioReceiverAgent, AudioConfig
+    from core_dispatch.launch_control.config.settings import LOG_FILE
+
     # Suppress verbose logs from underlying libraries
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
 
-    os.makedirs(LOGS_DIR, exist_ok=True)
-    log_file = LOGS_DIR / "core_dispatch.log"
-    logging.basicConfig(
-        level=logging.DEBUG if debug else logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+    # settings creates the log and data directories when it's imported
+    listener = _configure_logging(
+        debug,
+        "%(asctime)s | %(levelname)s | %(message)s",
+        _log_file_handler(LOG_FILE),
+        logging.StreamHandler()
     )
 
     def on_transcription(text: str):  # noqa: U100
         # Default no-op handler; override by passing a custom callback
         pass
 
-    config = AudioConfig(
-        sample_rate=SAMPLE_RATE,
-        channels=CHANNELS,
-        device_index=AUDIO_DEVICE_INDEX,
-        audio_threshold=AUDIO_THRESHOLD,
-        silence_threshold=SILENCE_THRESHOLD,
-        min_duration=MIN_RECORDING_DURATION,
-        max_duration=MAX_RECORDING_DURATION,
-        pre_roll=PRE_ROLL_DURATION,
-        post_roll=POST_ROLL_DURATION,
-        queue_size=10,
-        project_id=GOOGLE_CLOUD_PROJECT,
-        transcription_service_type=TRANSCRIPTION_SERVICE_TYPE,
-        api_key=OPENAI_API_KEY
-    )
+    # Fields not given on the command line default to the values from settings
+    config = AudioConfig(sample_rate=sample_rate, device_index=device_index, queue_size=10)
 
     agent = AudioReceiverAgent(config=config, on_transcription=on_transcription, debug_mode=debug)
 
@@ -97,84 +130,70 @@ def receiver(debug):  # pragma: no cover
         await agent.initialize()
         await agent.start()
         try:
-            while True:
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            pass
+            await _wait_for_exit_signal()
         finally:
             await agent.stop()
             await agent.cleanup()
 
     try:
-        asyncio.run(run())
+        _run_event_loop(run)
     except KeyboardInterrupt:
         click.echo("\nReceived exit signal. Cleaning up...")
+    finally:
+        listener.stop()
 
-def get_personas_from_profile(profile_name: str) -> list:
+@functools.lru_cache(maxsize=16)
+def get_personas_from_profile(profile_name: str) -> Tuple[str, ...]:
     """
     Retrieve persona file stems from a given profile directory.
     """
-    pkg_dir = Path(__file__).resolve().parent.parent  # points to src/core_dispatch
-    profiles_dir = pkg_dir / "personas"
-    profile_path = profiles_dir / profile_name
+    profile_path = _PROFILES_DIR / profile_name
     if not profile_path.exists():
-        raise FileNotFoundError(f"Profile '{profile_name}' does not exist in {profiles_dir}")
-    if profile_path.is_dir():
-        return [file.stem for file in profile_path.glob("*.json") if file.is_file()]
-    else:
+        raise FileNotFoundError(f"Profile '{profile_name}' does not exist in {_PROFILES_DIR}")
+    if not profile_path.is_dir():
         raise ValueError(f"Profile '{profile_name}' is not a valid directory.")
+    # One scandir pass; the dirent type answers is_file() without a stat per entry
+    with os.scandir(profile_path) as entries:
+        return tuple(
+            entry.name[:-len(".json")] for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        )
 
 @cli.command()
 @click.option('--profile', required=True, help="Profile or profile set to load")
 @click.option('--debug', is_flag=True, default=False, help='Enable debug logging')
-def transmitter(profile, debug):  # pragma: no cover
+@click.option('--device-index', type=int, default=_setting('TX_AUDIO_DEVICE_INDEX'),
+              show_default='TX_AUDIO_DEVICE_INDEX', help='Output device to play replies on')
+@click.option('--sample-rate', type=int, default=_setting('TX_SAMPLE_RATE'),
+              show_default='TX_SAMPLE_RATE', help='Playback sample rate in Hz')
+def transmitter(profile, debug, device_index, sample_rate):  # pragma: no cover
     """Start the audio transmitter service."""
+    # Imported here so --help and the other command don't load the audio stack
+    from core_dispatch.agent_framework.audio.transmitter import AudioTransmitterAgent, AudioTransmitterConfig
+
+    # Fields not given on the command line default to the values from settings
+    config = AudioTransmitterConfig(sample_rate=sample_rate, device_index=device_index)
+
     # Suppress verbose logs from underlying libraries
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
 
-    # Ensure necessary directories exist
-    os.makedirs(TTS_AUDIO_DIR, exist_ok=True)
-    os.makedirs(TRANSCRIPTIONS_DIR, exist_ok=True)
-    os.makedirs(PROCESSED_TRANSCRIPTIONS_DIR, exist_ok=True)
-
-    logging.basicConfig(
-        level=logging.DEBUG if debug else logging.INFO,
-        format=LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(TX_LOG_FILE),
-            logging.StreamHandler()
-        ]
+    # settings already created the TTS, transcription and processed directories on import
+    listener = _configure_logging(
+        debug,
+        config.log_format,
+        _log_file_handler(config.tx_log_file),
+        logging.StreamHandler()
     )
 
     try:
         personas = get_personas_from_profile(profile)
     except (FileNotFoundError, ValueError) as e:
         click.echo(f"Error: {e}", err=True)
+        listener.stop()
         sys.exit(1)
 
-    config = AudioTransmitterConfig(
-        sample_rate=TX_SAMPLE_RATE,
-        channels=TX_CHANNELS,
-        device_index=TX_AUDIO_DEVICE_INDEX,
-        audio_device=AUDIO_DEVICE,
-        api_key=OPENAI_API_KEY,
-        processed_files_json=PROCESSED_FILES_JSON,
-        tts_audio_dir=TTS_AUDIO_DIR,
-        context_expiration=CONTEXT_EXPIRATION,
-        response_queue_max_size=RESPONSE_QUEUE_MAX_SIZE,
-        conversation_history_limit=CONVERSATION_HISTORY_LIMIT,
-        tx_log_file=TX_LOG_FILE,
-        log_format=LOG_FORMAT,
-        transcriptions_dir=TRANSCRIPTIONS_DIR,
-        processed_transcriptions_dir=PROCESSED_TRANSCRIPTIONS_DIR,
-        transcriptions_log_file=TRANSCRIPTIONS_LOG_FILE,
-        tts_provider=TTS_PROVIDER,
-        unrealspeech_api_key=UNREALSPEECH_API_KEY,
-        default_voice=DEFAULT_VOICE
-    )
-
     agent = AudioTransmitterAgent(
         config=config,
         debug_mode=debug,
@@ -187,15 +206,14 @@ def transmitter(profile, debug):  # pragma: no cover
         await agent.start()
         click.echo("Audio transmitter is running. Press Ctrl+C to stop.")
         try:
-            while True:
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            pass
+            await _wait_for_exit_signal()
         finally:
             await agent.stop()
             click.echo("Audio transmitter stopped. Goodbye!")
 
     try:
-        asyncio.run(run())
+        _run_event_loop(run)
     except KeyboardInterrupt:
         click.echo("\nReceived exit signal. Cleaning up...")
+    finally:
+        listener.stop()
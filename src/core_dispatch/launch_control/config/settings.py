@@ -23,6 +23,8 @@ TX_LOG_FILE = LOGS_DIR / os.getenv('TX_LOG_FILE', 'tx_log.log')  # Transmitter-s
 
 # TTS provider (e.g., 'openai', 'unrealspeech')
 TTS_PROVIDER = os.getenv('TTS_PROVIDER', 'openai')  # Default to 'openai'
+# Disk budget for the synthesized-clip cache under TTS_AUDIO_DIR/cache
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_MB', 100)) * 1024 * 1024
 
 # Processed transcriptions
 PROCESSED_TRANSCRIPTIONS_DIR = DATA_DIR / os.getenv('PROCESSED_TRANSCRIPTIONS_DIR', 'processed_transcriptions')
@@ -34,6 +36,8 @@ TRANSCRIPTIONS_LOG_FILE = LOGS_DIR / os.getenv('TRANSCRIPTIONS_LOG_FILE', 'trans
 
 # Audio directories
 TRANSCRIPTIONS_DIR = Path(os.getenv('TRANSCRIPTIONS_DIR', DATA_DIR / "transcriptions"))
+# Use a polling watcher instead of inotify (needed when TRANSCRIPTIONS_DIR is on NFS)
+TRANSCRIPTIONS_WATCH_POLLING = os.getenv('TRANSCRIPTIONS_WATCH_POLLING', 'false').lower() in ('1', 'true', 'yes')
 AUDIO_DIR = Path(os.getenv('AUDIO_DIR', DATA_DIR / "audio"))
 TTS_AUDIO_DIR = Path(os.getenv('TTS_AUDIO_DIR', DATA_DIR / "tts_audio"))
 
@@ -46,6 +50,7 @@ TTS_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 SAMPLE_RATE = int(os.getenv('SAMPLE_RATE', 44100))
 CHANNELS = int(os.getenv('CHANNELS', 1))
 AUDIO_DEVICE_INDEX = int(os.getenv('AUDIO_DEVICE_INDEX', 1))
+AUDIO_BLOCKSIZE = int(os.getenv('AUDIO_BLOCKSIZE', 1024))  # Frames per input callback
 AUDIO_THRESHOLD = float(os.getenv('AUDIO_THRESHOLD', 0.001))
 SILENCE_THRESHOLD = float(os.getenv('SILENCE_THRESHOLD', 1.0))
 MIN_RECORDING_DURATION = float(os.getenv('MIN_RECORDING_DURATION', 0.5))
@@ -58,11 +63,21 @@ TX_SAMPLE_RATE = int(os.getenv('TX_SAMPLE_RATE', 44100))
 TX_CHANNELS = int(os.getenv('TX_CHANNELS', 1))
 TX_AUDIO_DEVICE_INDEX = int(os.getenv('TX_AUDIO_DEVICE_INDEX', 1))
 AUDIO_DEVICE = os.getenv('AUDIO_DEVICE', 'default')
+# 'aplay' spawns aplay/mpg123 on AUDIO_DEVICE per clip; 'sounddevice' keeps one output stream
+# open on TX_AUDIO_DEVICE_INDEX instead (check that index is the radio before switching)
+TX_PLAYBACK_BACKEND = os.getenv('TX_PLAYBACK_BACKEND', 'aplay').lower()
+# Seconds the receiver stays paused after the last clip, so it doesn't pick up the tail of our own audio
+TX_RELEASE_DELAY = float(os.getenv('TX_RELEASE_DELAY', 0.25))
 
 # Conversation settings
 CONTEXT_EXPIRATION = timedelta(minutes=int(os.getenv('CONTEXT_EXPIRATION', 5)))  # Default: 5 minutes
 RESPONSE_QUEUE_MAX_SIZE = int(os.getenv('RESPONSE_QUEUE_MAX_SIZE', 10))  # Default: 10
 CONVERSATION_HISTORY_LIMIT = int(os.getenv('CONVERSATION_HISTORY_LIMIT', 20))  # Default: 20
+CHAT_CACHE_SIZE = int(os.getenv('CHAT_CACHE_SIZE', 0))  # Cached replies for identical conversations; 0 disables
+# Reuse a reply when a new turn's embedding is at least this similar to a cached one; 0 disables
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0))
+SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', 512))
+SEMANTIC_CACHE_PATH = Path(os.getenv('SEMANTIC_CACHE_PATH', DATA_DIR / "semantic_cache.npz"))
 
 # Transcription service config
 TRANSCRIPTION_SERVICE_TYPE = os.getenv('TRANSCRIPTION_SERVICE_TYPE', 'google-chirp')
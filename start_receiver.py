@@ -1,11 +1,7 @@
 #!/usr/bin/env python3
 """Start core-dispatch receiver via CLI."""
-import sys
-
-from core_dispatch.launch_control.cli import cli
+from core_dispatch.launch_control.cli import receiver
 
 if __name__ == "__main__":
-    # Delegate to core-dispatch CLI receiver command
-    sys.argv.insert(1, "receiver")
-    cli()
-
+    # Run the receiver command directly rather than dispatching through the cli group
+    receiver(prog_name="core-dispatch receiver")
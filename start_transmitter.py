@@ -1,11 +1,7 @@
 #!/usr/bin/env python3
 """Start core-dispatch transmitter via CLI."""
-import sys
-
-from core_dispatch.launch_control.cli import cli
+from core_dispatch.launch_control.cli import transmitter
 
 if __name__ == "__main__":
-    # Delegate to core-dispatch CLI transmitter command
-    sys.argv.insert(1, "transmitter")
-    cli()
-
+    # Run the transmitter command directly rather than dispatching through the cli group
+    transmitter(prog_name="core-dispatch transmitter")
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from core_dispatch.agent_framework.utils import json_codec
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def codec(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_codec, 'orjson', None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    return json_codec
+
+
+def test_dumps_writes_utf8_json_bytes(codec):
+    data = {'timestamp': '2024-01-01T12:00:00', 'transcription': "Dispatch, radio check é", 'tool_response': None}
+    encoded = codec.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode('utf-8')) == data
+
+
+def test_dumps_round_trips_through_loads(codec):
+    data = {'timestamp': '2024-01-01T12:00:00', 'transcription': "Dispatch, radio check é", 'tool_response': None}
+    encoded = codec.dumps(data)
+
+    assert codec.loads(encoded) == data
+    assert codec.loads(encoded.decode('utf-8')) == data
+
+
+def test_canonical_is_compact_and_key_order_independent(codec):
+    first = codec.canonical({'b': 1, 'a': [1, 2]})
+    second = codec.canonical({'a': [1, 2], 'b': 1})
+
+    assert first == second == b'{"a":[1,2],"b":1}'
+
+
+def test_canonical_matches_between_backends(monkeypatch):
+    messages = [{'role': 'user', 'content': "Copy, over."}, {'role': 'system', 'content': "x"}]
+    expected = json.dumps(messages, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    assert json_codec.canonical(messages) == expected
+    monkeypatch.setattr(json_codec, 'orjson', None)
+    assert json_codec.canonical(messages) == expected
@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pytest
+
+try:
+    from core_dispatch.agent_framework.audio import receiver
+except (ImportError, OSError) as e:  # sounddevice raises OSError when PortAudio is missing
+    pytest.skip(f"receiver dependencies unavailable: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(receiver, 'create_transcription_service', lambda service_type, config: None)
+    # 4 samples of pre-roll, takes of up to 20 samples
+    config = receiver.AudioConfig(sample_rate=10, channels=1, pre_roll=0.4, max_duration=1.6)
+    return receiver.AudioReceiverAgent(config, on_transcription=lambda text: None)
+
+
+def _block(*samples):
+    return np.array(samples, dtype=np.float32).reshape(-1, 1)
+
+
+def _take(agent):
+    return agent._rec_buf[:agent._rec_write_idx, 0].tolist()
+
+
+def test_partial_pre_roll_starts_the_take(agent):
+    agent._push_pre_roll(_block(1, 2, 3))
+    agent._start_recording()
+
+    assert _take(agent) == [1, 2, 3]
+
+
+def test_wrapped_pre_roll_keeps_the_newest_samples_in_order(agent):
+    agent._push_pre_roll(_block(1, 2, 3))
+    agent._push_pre_roll(_block(4, 5, 6))
+    agent._start_recording()
+
+    assert _take(agent) == [3, 4, 5, 6]
+
+
+def test_block_longer_than_pre_roll_replaces_it(agent):
+    agent._push_pre_roll(_block(1, 2))
+    agent._push_pre_roll(_block(3, 4, 5, 6, 7, 8))
+    agent._start_recording()
+
+    assert _take(agent) == [5, 6, 7, 8]
+
+
+def test_take_is_clipped_at_the_buffer_end(agent):
+    agent._start_recording()
+    agent._append_to_recording(_block(*range(15)))
+    agent._append_to_recording(_block(*range(15)))
+
+    assert agent._rec_write_idx == len(agent._rec_buf) == 20
+
+
+def test_transmission_discards_the_take_and_pre_roll(agent):
+    agent._push_pre_roll(_block(1, 2, 3))
+    agent._start_recording()
+    agent._append_to_recording(_block(4, 5))
+
+    agent._discard_capture()
+    agent._push_pre_roll(_block(9))
+    agent._start_recording()
+
+    assert _take(agent) == [9]
+
+
+def test_callback_drops_capture_once_the_transmitter_keys_up(agent):
+    agent._tx_active = threading.Event()
+    agent._push_pre_roll(_block(1, 2, 3))
+    agent._start_recording()
+
+    agent._tx_active.set()
+    agent._audio_callback(_block(0.9, 0.9), 2, None, None)
+
+    assert not agent.recording
+    assert agent._pre_roll_filled == 0
+    assert agent._rec_write_idx == 0
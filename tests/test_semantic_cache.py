@@ -0,0 +1,80 @@
+import numpy as np
+
+from core_dispatch.agent_framework.utils.semantic_cache import SemanticCache
+
+
+def _vec(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_lookup_matches_near_duplicates_for_the_same_persona_only(tmp_path):
+    cache = SemanticCache(tmp_path / 'cache.npz', threshold=0.9)
+    cache.add(_vec(1, 0, 0), 'dispatch', "Copy that.")
+
+    assert cache.lookup(_vec(10, 1, 0), 'dispatch') == "Copy that."
+    assert cache.lookup(_vec(1, 0, 0), 'logistics') is None
+    assert cache.lookup(_vec(0, 1, 0), 'dispatch') is None
+
+
+def test_full_cache_replaces_the_least_recently_used_entry(tmp_path):
+    cache = SemanticCache(tmp_path / 'cache.npz', threshold=0.9, capacity=2)
+    cache.add(_vec(1, 0, 0), 'dispatch', "first")
+    cache.add(_vec(0, 1, 0), 'dispatch', "second")
+    # A hit makes "first" the most recently used, so "second" goes
+    assert cache.lookup(_vec(1, 0, 0), 'dispatch') == "first"
+    cache.add(_vec(0, 0, 1), 'dispatch', "third")
+
+    assert cache.lookup(_vec(0, 1, 0), 'dispatch') is None
+    assert cache.lookup(_vec(1, 0, 0), 'dispatch') == "first"
+    assert cache.lookup(_vec(0, 0, 1), 'dispatch') == "third"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / 'cache.npz'
+    cache = SemanticCache(path, threshold=0.9)
+    cache.add(_vec(1, 0, 0), 'dispatch', "Copy that.")
+    cache.add(_vec(0, 1, 0), 'logistics', "Aisle 5.")
+    cache.save()
+
+    reloaded = SemanticCache(path, threshold=0.9)
+    assert reloaded.lookup(_vec(1, 0, 0), 'dispatch') == "Copy that."
+    assert reloaded.lookup(_vec(0, 1, 0), 'logistics') == "Aisle 5."
+    assert not (tmp_path / 'cache.npz.tmp.npz').exists()
+
+
+def test_load_keeps_the_most_recent_entries_when_capacity_shrinks(tmp_path):
+    path = tmp_path / 'cache.npz'
+    cache = SemanticCache(path, threshold=0.9)
+    cache.add(_vec(1, 0, 0), 'dispatch', "old")
+    cache.add(_vec(0, 1, 0), 'dispatch', "newer")
+    cache.add(_vec(0, 0, 1), 'dispatch', "newest")
+    cache.save()
+
+    reloaded = SemanticCache(path, threshold=0.9, capacity=2)
+    assert reloaded.lookup(_vec(1, 0, 0), 'dispatch') is None
+    assert reloaded.lookup(_vec(0, 1, 0), 'dispatch') == "newer"
+    assert reloaded.lookup(_vec(0, 0, 1), 'dispatch') == "newest"
+    # New entries keep counting from where the saved clock left off
+    reloaded.add(_vec(1, 1, 0), 'dispatch', "latest")
+    assert reloaded.lookup(_vec(0, 0, 1), 'dispatch') == "newest"
+
+
+def test_unreadable_cache_file_starts_empty(tmp_path):
+    path = tmp_path / 'cache.npz'
+    path.write_bytes(b'not an npz')
+
+    cache = SemanticCache(path)
+    assert cache.lookup(_vec(1, 0, 0), 'dispatch') is None
+
+
+def test_entries_from_a_different_embedding_size_are_dropped(tmp_path):
+    path = tmp_path / 'cache.npz'
+    cache = SemanticCache(path, threshold=0.9)
+    cache.add(_vec(1, 0, 0), 'dispatch', "Copy that.")
+    cache.save()
+
+    # e.g. the embedding model changed between runs
+    reloaded = SemanticCache(path, threshold=0.9)
+    assert reloaded.lookup(_vec(1, 0, 0, 0), 'dispatch') is None
+    reloaded.add(_vec(0, 1, 0, 0), 'dispatch', "Stand by.")
+    assert reloaded.lookup(_vec(0, 1, 0, 0), 'dispatch') == "Stand by."
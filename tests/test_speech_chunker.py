@@ -0,0 +1,54 @@
+from core_dispatch.agent_framework.utils.speech_chunker import SpeechChunker, split_for_speech
+
+
+def test_short_sign_off_joins_the_sentence_before_it():
+    text = "Copy, we have ten cases of almond milk in aisle five. Over."
+
+    assert split_for_speech(text) == [text]
+
+
+def test_abbreviations_and_initials_do_not_end_a_sentence():
+    text = "Dr. Smith met J. R. Jones at the U.S. border crossing near exit nine."
+
+    assert split_for_speech(text) == [text]
+
+
+def test_long_sentences_become_separate_chunks():
+    first = "The truck is loaded and ready to leave the north dock."
+    second = "Driver confirms the route through the east gate tonight."
+
+    assert split_for_speech(f"{first} {second}") == [first, second]
+
+
+def test_short_leading_sentences_wait_for_the_next_one():
+    assert split_for_speech("Copy. Stand by. The forklift is on its way to bay seven now.") == [
+        "Copy. Stand by. The forklift is on its way to bay seven now."
+    ]
+
+
+def test_line_breaks_are_boundaries():
+    first = "Unit four, proceed to the loading dock at once"
+    second = "Unit six, hold your position at the front gate"
+
+    assert split_for_speech(f"{first}\n{second}") == [first, second]
+
+
+def test_streamed_pieces_match_the_whole_text():
+    text = ("Copy that. The pallet of canned beans is in aisle twelve, top shelf. "
+            "Mr. Lebowski is 3.5 feet away! Over.")
+    chunker = SpeechChunker()
+    streamed = []
+    for i in range(0, len(text), 7):
+        streamed.extend(chunker.feed(text[i:i + 7]))
+    streamed.extend(chunker.flush())
+
+    assert streamed == split_for_speech(text)
+    assert ' '.join(streamed) == text
+
+
+def test_nothing_is_released_before_the_next_sentence_arrives():
+    chunker = SpeechChunker()
+
+    assert chunker.feed("The truck is loaded and ready to leave the north dock. ") == []
+    assert chunker.flush() == ["The truck is loaded and ready to leave the north dock."]
+    assert chunker.flush() == []
@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from core_dispatch.agent_framework.tools.tool_result import DirectReply
+from core_dispatch.agent_framework.utils import json_codec
+from core_dispatch.agent_framework.utils.speech_chunker import split_for_speech
+
+try:
+    from core_dispatch.agent_framework.audio.transmitter import AudioTransmitterAgent, AudioTransmitterConfig
+except (ImportError, OSError) as e:  # sounddevice raises OSError when PortAudio is missing
+    pytest.skip(f"transmitter dependencies unavailable: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    # The conversation log is opened relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    for name in ('transcriptions', 'processed', 'tts'):
+        (tmp_path / name).mkdir()
+    config = AudioTransmitterConfig(
+        api_key='test',
+        transcriptions_dir=str(tmp_path / 'transcriptions'),
+        processed_transcriptions_dir=str(tmp_path / 'processed'),
+        tts_audio_dir=str(tmp_path / 'tts'),
+        tx_log_file=str(tmp_path / 'tx.log'),
+        transcriptions_log_file=str(tmp_path / 'transcriptions.log'),
+        semantic_cache_threshold=0,
+    )
+    agent = AudioTransmitterAgent(config, persona_names=[], profile_name='test')
+    yield agent
+    agent._tts_executor.shutdown(wait=True)
+    agent._convo_log_fh.close()
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("TOOL_CALL InventoryLookupTool: lookup paddle boards",
+     "InventoryLookupTool: paddle boards "),
+    ("  TOOL_CALL   InventoryLookupTool :lookup   paddle boards  ",
+     "InventoryLookupTool: paddle boards "),
+    ("TOOL_CALL MissingTool: lookup paddle boards", "MissingTool: not found in self.tools."),
+    ("TOOL_CALL InventoryLookupTool: restock paddle boards",
+     "InventoryLookupTool: method 'restock' not found."),
+    ("TOOL_CALL InventoryLookupTool lookup paddle boards",
+     "Invalid format, expected 'TOOL_CALL <tool>: <method> <args>'."),
+    ("look up paddle boards", "Invalid tool call."),
+])
+def test_tool_call_parsing(agent, line, expected):
+    result = agent._invoke_tool(line)
+
+    assert isinstance(result, str)
+    assert result.startswith(expected)
+
+
+def _write_transcription(agent, name, text="dispatch, radio check", age=5.0):
+    path = os.path.join(agent.config.transcriptions_dir, name)
+    with open(path, 'wb') as f:
+        f.write(json_codec.dumps({'timestamp': datetime.now().isoformat(), 'transcription': text}))
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_sweep_finds_files_older_than_ones_already_handled(agent):
+    _write_transcription(agent, 'b.json', age=5)
+    assert agent._load_new_transcriptions() == ['b.json']
+    agent._dispatched.add('b.json')
+    # Written earlier but only landed now, e.g. moved in from another host
+    _write_transcription(agent, 'a.json', age=60)
+
+    assert agent._load_new_transcriptions() == ['a.json']
+
+
+def test_sweep_leaves_files_that_are_still_being_written(agent):
+    _write_transcription(agent, 'fresh.json', age=0)
+
+    assert agent._load_new_transcriptions() == []
+
+
+def test_unparsable_file_is_retried_once_it_changes(agent):
+    path = os.path.join(agent.config.transcriptions_dir, 'partial.json')
+    with open(path, 'w') as f:
+        f.write('{"timestamp": ')
+    os.utime(path, (time.time() - 5, time.time() - 5))
+
+    assert agent._load_new_transcriptions() == ['partial.json']
+    assert agent._read_transcription('partial.json') is None
+    # Unchanged, so the next sweep skips it instead of failing on it again
+    assert agent._load_new_transcriptions() == []
+
+    _write_transcription(agent, 'partial.json', text="dispatch, come in")
+    assert agent._load_new_transcriptions() == ['partial.json']
+    entry = agent._read_transcription('partial.json')
+    assert entry[1] == "dispatch, come in"
+    assert 'partial.json' not in agent._unreadable
+
+
+def _persona(prompt='', voices=None, phrases=(), direct_replies=None):
+    return {
+        'prompt': prompt,
+        'system_prompt': prompt,
+        '_uses_time': False,
+        '_uses_tools': 'TOOL_CALL' in prompt,
+        '_uses_say': 'SAY:' in prompt,
+        'voices': voices or {},
+        'activation_phrases': list(phrases),
+        'activation_phrases_lower': [p.lower() for p in phrases],
+        'direct_replies': direct_replies or {},
+    }
+
+
+def _queued_speech(agent):
+    spoken = []
+    while not agent.response_queue.empty():
+        spoken.append(agent.response_queue.get_nowait().result())
+    return spoken
+
+
+def test_say_lines_play_before_the_answer_in_the_persona_voice(agent, monkeypatch):
+    agent.personas = {'warehouse': _persona('Use TOOL_CALL when needed.', voices={'openai': 'ash'})}
+    monkeypatch.setattr(agent, '_text_to_speech', lambda text, voice: (text, voice))
+    monkeypatch.setattr(
+        agent, '_call_gpt4',
+        lambda messages, persona, on_sentence=None: "SAY: Copy, stand by.\nCopy, we have it in aisle 5. Over."
+    )
+
+    agent._handle_transcription(datetime.now(), "warehouse, got milk?", None, 'missing.json')
+
+    assert _queued_speech(agent) == [
+        ("Copy, stand by.", 'ash'),
+        ("Copy, we have it in aisle 5. Over.", 'ash'),
+    ]
+
+
+def _scripted_gpt4(*replies):
+    """Stand-in for _call_gpt4 that returns the given replies in turn and counts calls."""
+    calls = []
+
+    def call(messages, persona, on_sentence=None):
+        calls.append(messages)
+        return replies[len(calls) - 1]
+    return call, calls
+
+
+def test_direct_reply_uses_the_persona_template(agent, monkeypatch):
+    template = "Copy, we have {quantity} {item} in aisle {aisle}. Over."
+    agent.personas = {'warehouse': _persona(
+        'Use TOOL_CALL when needed.', direct_replies={'InventoryLookupTool': template}
+    )}
+    monkeypatch.setattr(agent, '_text_to_speech', lambda text, voice: text)
+    call, calls = _scripted_gpt4("TOOL_CALL InventoryLookupTool: lookup organic almond milk")
+    monkeypatch.setattr(agent, '_call_gpt4', call)
+
+    agent._handle_transcription(datetime.now(), "warehouse, almond milk?", None, 'missing.json')
+
+    assert len(calls) == 1
+    assert _queued_speech(agent) == ["Copy, we have 10 organic almond milk in aisle 5. Over."]
+
+
+def test_direct_reply_falls_back_to_second_pass_without_a_template(agent, monkeypatch):
+    agent.personas = {'dude': _persona('Use TOOL_CALL when needed.')}
+    monkeypatch.setattr(agent, '_text_to_speech', lambda text, voice: text)
+    call, calls = _scripted_gpt4("TOOL_CALL InventoryLookupTool: lookup organic almond milk", "Yeah, aisle 5, man.")
+    monkeypatch.setattr(agent, '_call_gpt4', call)
+
+    agent._handle_transcription(datetime.now(), "dude, almond milk?", None, 'missing.json')
+
+    assert len(calls) == 2
+    assert calls[1][-1] == {
+        'role': 'assistant',
+        'content': "TOOL_RESPONSE InventoryLookupTool: organic almond milk 10 in aisle 5",
+    }
+    # The scripted second pass doesn't stream, so the final text is spoken in one piece
+    assert _queued_speech(agent) == ["Yeah, aisle 5, man."]
+
+
+def test_tool_call_passes_direct_replies_through(agent):
+    result = agent._invoke_tool("TOOL_CALL InventoryLookupTool: lookup organic almond milk")
+
+    assert isinstance(result, DirectReply)
+    assert result.tool == 'InventoryLookupTool'
+    assert result.data == "InventoryLookupTool: organic almond milk 10 in aisle 5"
+    assert result.fields == {'item': 'organic almond milk', 'quantity': 10, 'aisle': 5}
+
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_activation_follows_persona_order_not_position_in_text(agent, monkeypatch, use_automaton):
+    from core_dispatch.agent_framework.audio import transmitter
+    if not use_automaton:
+        monkeypatch.setattr(transmitter, 'ahocorasick', None)
+    elif transmitter.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    agent.personas = {
+        'dispatch': _persona(phrases=['Dispatch']),
+        'logistics': _persona(phrases=['Logistics', 'Supply run']),
+    }
+    agent._build_activation_matcher()
+
+    assert agent._match_activation("logistics, dispatch, come in") == 'dispatch'
+    assert agent._match_activation("supply run for logistics") == 'logistics'
+    assert agent._match_activation("radio check") is None
+
+
+@pytest.mark.parametrize('observer, polling, idle_sweeps', [
+    (None, False, True),        # no watchdog
+    (object(), True, True),     # PollingObserver
+    (object(), False, False),   # inotify
+])
+def test_idle_sweeps_only_without_an_inotify_watcher(agent, monkeypatch, observer, polling, idle_sweeps):
+    from core_dispatch.agent_framework.audio import transmitter
+    monkeypatch.setattr(transmitter, 'IDLE_SWEEP_SECONDS', 0.01)
+    agent._observer = observer
+    agent.config.transcriptions_watch_polling = polling
+    sweeps = []
+    monkeypatch.setattr(agent, '_queue_existing_transcriptions', lambda: sweeps.append(1))
+
+    thread = threading.Thread(target=agent._generate_response)
+    thread.start()
+    time.sleep(0.2)
+    agent.terminate_flag.set()
+    agent._pending_files.put(None)
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    # The startup drain always runs
+    assert (len(sweeps) > 1) == idle_sweeps
+
+
+def test_say_lines_are_spoken_once_when_the_persona_has_no_tools(agent, monkeypatch):
+    agent.personas = {'dispatch': _persona("Acknowledge with 'SAY: Copy.' first.")}
+    monkeypatch.setattr(agent, '_text_to_speech', lambda text, voice: text)
+    reply = "SAY: Copy, stand by.\nThe truck is loaded and ready to leave the north dock. Over."
+
+    def call(messages, persona, on_sentence=None):
+        # Stream like _call_gpt4 would if given a callback
+        for piece in split_for_speech(reply) if on_sentence else ():
+            on_sentence(piece)
+        return reply
+    monkeypatch.setattr(agent, '_call_gpt4', call)
+
+    agent._handle_transcription(datetime.now(), "dispatch, radio check", None, 'missing.json')
+
+    assert _queued_speech(agent) == [
+        "Copy, stand by.",
+        "The truck is loaded and ready to leave the north dock. Over.",
+    ]
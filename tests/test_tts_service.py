@@ -0,0 +1,99 @@
+import os
+
+from core_dispatch.agent_framework.utils.tts_service import BaseTTSService
+
+
+class FakeTTSService(BaseTTSService):
+    """Writes a clip of fixed size per synthesis and counts the calls."""
+    provider = 'fake'
+
+    def __init__(self, tts_audio_dir, cache_max_bytes, clip_bytes=100):
+        super().__init__(tts_audio_dir, cache_max_bytes)
+        self.clip_bytes = clip_bytes
+        self.calls = []
+
+    def synthesize_text(self, text, voice, debug_mode=False):
+        self.calls.append(text)
+        path = self._new_audio_path(self.file_extension, debug_mode)
+        with open(path, 'wb') as f:
+            f.write(b'\0' * self.clip_bytes)
+        return path
+
+
+def test_whitespace_and_case_variants_share_a_cached_clip(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=10_000)
+
+    first = tts.synthesize_cached("Copy that.", 'ash')
+    second = tts.synthesize_cached("  copy   THAT. ", 'ash')
+
+    assert tts.calls == ["Copy that."]
+    assert tts.is_cached_file(second)
+    assert not tts.is_cached_file(first)
+    assert tts._cache_path("Copy that.", 'ash') != tts._cache_path("Copy that.", 'onyx')
+
+
+def test_clips_are_written_next_to_the_cache_with_unique_names(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=10_000)
+
+    paths = [tts.synthesize_text("Copy.", 'ash', debug_mode=True) for _ in range(5)]
+
+    assert len(set(paths)) == 5
+    assert all(os.path.dirname(p) == str(tmp_path) for p in paths)
+    assert all(os.path.basename(p).startswith('response_') for p in paths)
+
+
+def test_eviction_drops_least_recently_used_clips_first(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=250)
+    for text in ("one", "two"):
+        tts.release_clip(tts.synthesize_cached(text, 'ash'))
+    # Reuse "one" so "two" becomes the oldest
+    tts.release_clip(tts.synthesize_cached("one", 'ash'))
+    tts.synthesize_cached("three", 'ash')
+
+    assert not os.path.exists(tts._cache_path("two", 'ash'))
+    assert os.path.exists(tts._cache_path("one", 'ash'))
+    assert os.path.exists(tts._cache_path("three", 'ash'))
+    assert tts._cache_bytes == 200
+
+
+def test_pinned_clips_survive_eviction_until_released(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=150)
+    tts.synthesize_cached("one", 'ash')
+    pinned = tts.synthesize_cached("one", 'ash')  # cache hit, waiting to play
+    tts.synthesize_cached("two", 'ash')
+
+    assert os.path.exists(pinned)
+    assert not os.path.exists(tts._cache_path("two", 'ash'))
+
+    tts.release_clip(pinned)
+    tts.synthesize_cached("three", 'ash')
+    assert not os.path.exists(pinned)
+    assert tts._cache_bytes == 100
+
+
+def test_cache_index_is_reloaded_in_lru_order(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=10_000)
+    for text in ("one", "two"):
+        tts.synthesize_cached(text, 'ash')
+    os.utime(tts._cache_path("one", 'ash'), (2_000_000_000, 2_000_000_000))
+    os.utime(tts._cache_path("two", 'ash'), (1_000_000_000, 1_000_000_000))
+
+    reloaded = FakeTTSService(str(tmp_path), cache_max_bytes=150)
+    assert reloaded._cache_bytes == 200
+    reloaded.release_clip(reloaded.synthesize_cached("one", 'ash'))
+    assert reloaded.calls == []
+
+    reloaded.synthesize_cached("three", 'ash')
+    assert not os.path.exists(reloaded._cache_path("two", 'ash'))
+    assert os.path.exists(reloaded._cache_path("three", 'ash'))
+
+
+def test_clip_deleted_behind_the_cache_is_synthesized_again(tmp_path):
+    tts = FakeTTSService(str(tmp_path), cache_max_bytes=10_000)
+    tts.synthesize_cached("Copy.", 'ash')
+    os.remove(tts._cache_path("Copy.", 'ash'))
+
+    tts.synthesize_cached("Copy.", 'ash')
+
+    assert tts.calls == ["Copy.", "Copy."]
+    assert tts._cache_bytes == 100